@@ -3,6 +3,9 @@ from snowmobile import snowcreds
 from snowmobile import snowquery
 from snowmobile import snowloader
 from snowmobile import snowscripter
+from snowmobile import snowcache
+from snowmobile import snowunloader
+from snowmobile import snowledger
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
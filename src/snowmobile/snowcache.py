@@ -0,0 +1,301 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+import sqlparse
+import pandas as pd
+
+
+class ResultCache:
+    """Size-bounded LRU cache of query results with a time-to-live.
+
+    Results are held in memory and, if a ``directory`` is passed, written to
+    Feather files within it so they survive the process and are read back
+    on an in-memory miss. Only read-only statements are cached.
+
+    .. code-block:: python
+
+        from snowmobile import snowcache, snowquery
+
+        results = snowcache.ResultCache(ttl=3600, directory='.results')
+        sf = snowquery.Connector(result_cache=results)
+
+    Args:
+        ttl: Number of seconds a result remains valid after being cached.
+        max_bytes: Maximum in-memory size of cached results in bytes, beyond
+            which the least recently used results are evicted.
+        directory: Directory in which to keep on-disk copies of results;
+            requires pyarrow.
+        max_disk_bytes: Maximum size of the files in ``directory`` in bytes,
+            beyond which the least recently used files are deleted.
+
+    """
+    def __init__(self, ttl: float = 3600, max_bytes: int = 512 * 2 ** 20,
+                 directory: str = '', max_disk_bytes: int = 4 * 2 ** 30):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+
+        self._lock = threading.Lock()
+        # key: (DataFrame, time cached, bytes, query id)
+        self._entries = OrderedDict()
+        self._bytes = 0
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def normalize(sql: str) -> str:
+        """Strips comments and insignificant whitespace from a statement."""
+        formatted = sqlparse.format(sql, strip_comments=True,
+                                    strip_whitespace=True)
+
+        # A comment before the terminator leaves whitespace ahead of it
+        return formatted.strip().rstrip(';').rstrip()
+
+    @staticmethod
+    def cacheable(sql: str) -> bool:
+        """Checks that a statement only reads data."""
+        statements = sqlparse.parse(sql)
+        return len(statements) == 1 and statements[0].get_type() == 'SELECT'
+
+    @staticmethod
+    def key(sql: str, context: tuple = ()) -> str:
+        """Key for a statement executed in a session context.
+
+        Args:
+            sql: Raw SQL of the statement
+            context: Values that determine the statement's results besides
+                its text, such as (role, warehouse, database, schema)
+
+        """
+        text = '\x1f'.join([ResultCache.normalize(sql)] +
+                            [str(v) for v in context])
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get(self, key: str) -> pd.DataFrame:
+        """Returns a copy of a cached result or None if absent or expired."""
+        return self.lookup(key)[0]
+
+    def lookup(self, key: str) -> tuple:
+        """Returns a cached result with the query id that produced it.
+
+        Returns:
+            Tuple of (copy of the DataFrame, query id), or (None, '') if
+            absent or expired
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[1] < self.ttl:
+                self._entries.move_to_end(key)
+                return entry[0].copy(), entry[3]
+            if entry:
+                self._pop(key)
+
+        path = self._path(key)
+        if not path:
+            return None, ''
+
+        try:
+            import pyarrow.feather as feather
+
+            cached_at = os.path.getmtime(path)
+            if now - cached_at >= self.ttl:
+                os.remove(path)
+                return None, ''
+            table = feather.read_table(path)
+            os.utime(path, (now, cached_at))
+
+        except (OSError, ValueError):
+            return None, ''
+
+        sfqid = (table.schema.metadata or {}).get(b'sfqid', b'').decode()
+        df = table.to_pandas()
+
+        self._store(key, df, cached_at, sfqid)
+        return df.copy(), sfqid
+
+    def put(self, key: str, df: pd.DataFrame, sfqid: str = '') -> None:
+        """Caches a result, evicting least recently used results if needed.
+
+        Results that can't be written to ``directory``, such as those with
+        duplicate column names or columns of mixed types, aren't cached.
+
+        Args:
+            key: Key of the result as returned by :meth:`key`
+            df: Result to cache
+            sfqid: Query id of the execution that produced the result
+        """
+        df = df.copy()
+        cached_at = time.time()
+
+        path = self._path(key)
+        if path:
+            import pyarrow as pa
+            import pyarrow.feather as feather
+
+            try:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                table = table.replace_schema_metadata(
+                    {**(table.schema.metadata or {}),
+                     b'sfqid': sfqid.encode()})
+                feather.write_feather(table, path)
+
+            except (ValueError, TypeError, NotImplementedError, OSError):
+                if os.path.isfile(path):
+                    os.remove(path)
+                return None
+
+            self._evict_files()
+
+        self._store(key, df, cached_at, sfqid)
+
+        return None
+
+    def invalidate(self, key: str) -> None:
+        """Removes a single result from memory and disk."""
+        with self._lock:
+            self._pop(key)
+
+        path = self._path(key)
+        if path and os.path.isfile(path):
+            os.remove(path)
+
+        return None
+
+    def clear(self) -> None:
+        """Removes all results from memory and disk."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+        for path in self._files():
+            os.remove(path)
+
+        return None
+
+    def _store(self, key: str, df: pd.DataFrame, cached_at: float,
+               sfqid: str = '') -> None:
+        size = int(df.memory_usage(deep=True).sum())
+        if size > self.max_bytes:
+            return None
+
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (df, cached_at, size, sfqid)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+        return None
+
+    def _pop(self, key: str) -> None:
+        """Removes a result from memory; call with lock held."""
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._bytes -= entry[2]
+
+        return None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.feather") \
+            if self.directory else ''
+
+    def _files(self) -> list:
+        if not self.directory:
+            return []
+
+        return [entry.path for entry in os.scandir(self.directory)
+                if entry.name.endswith('.feather')]
+
+    def _evict_files(self) -> None:
+        """Deletes least recently read files beyond ``max_disk_bytes``."""
+        files = sorted(((os.stat(path), path) for path in self._files()),
+                       key=lambda f: f[0].st_atime)
+        total = sum(stat.st_size for stat, _ in files)
+
+        for stat, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= stat.st_size
+
+        return None
+
+
+class SpilledResult:
+    """Memory-mapped handle on query results spilled to a Feather file.
+
+    Nothing is read into memory on instantiation; columns and row ranges
+    are read from the memory-mapped file as they are accessed, so slicing a
+    result much larger than memory only pages in the data sliced.
+
+    .. code-block:: python
+
+        extract = sf.spill_query('select * from huge_table', '/data/extracts')
+        extract.columns
+        sample = extract.to_pandas(columns=['ID', 'AMOUNT'], rows=(0, 1000))
+
+    Args:
+        path: Path to an uncompressed Feather (Arrow IPC) file.
+
+    """
+    def __init__(self, path: str):
+        import pyarrow as pa
+
+        self.path = path
+        self._source = pa.memory_map(path)
+        self._reader = pa.ipc.open_file(self._source)
+
+    @property
+    def schema(self) -> object:
+        """pyarrow.Schema of the results."""
+        return self._reader.schema
+
+    @property
+    def columns(self) -> list:
+        """Column names of the results."""
+        return self.schema.names
+
+    @property
+    def num_rows(self) -> int:
+        """Number of rows in the results."""
+        return sum(self._reader.get_batch(i).num_rows
+                   for i in range(self._reader.num_record_batches))
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    def read(self, columns: list = None, rows: tuple = None) -> object:
+        """Reads results as a pyarrow.Table backed by the memory map.
+
+        Args:
+            columns: Names of columns to read; reads all if not passed
+            rows: Tuple of (start, stop) row positions to read; reads all if
+                not passed
+        Returns:
+            pyarrow.Table referencing the file's memory without copying it
+
+        """
+        table = self._reader.read_all()
+        if columns:
+            table = table.select(columns)
+        if rows:
+            start, stop = rows
+            table = table.slice(start, stop - start)
+
+        return table
+
+    def to_pandas(self, columns: list = None, rows: tuple = None) -> \
+            pd.DataFrame:
+        """Reads results into a DataFrame; accepts the arguments of read()."""
+        return self.read(columns=columns, rows=rows).to_pandas()
+
+    def close(self) -> None:
+        """Releases the memory map."""
+        self._source.close()
+        return None
@@ -1,11 +1,281 @@
-
-
+import re
+import time
+import atexit
+import threading
 import snowflake.connector
 from snowmobile import snowcreds as creds
 from fcache.cache import FileCache
 
 cache = FileCache('snowmobile', flag='cs')
 
+# Heartbeats keep idle sessions (and their master tokens) from expiring
+KEEP_ALIVE = True
+HEARTBEAT_FREQUENCY = 3600
+
+# Binds parameters server-side so statement text is constant across values;
+# this applies to every cursor on a session, so statements binding with
+# %s or %(name)s placeholders must use ? instead
+PARAMSTYLE = 'qmark'
+
+# Number of seconds to wait for a pooled session once ``max_size`` are
+# checked out, after which an unpooled session is opened instead
+CHECKOUT_TIMEOUT = 30
+
+# Statements that leave state on a session beyond their own execution, such
+# as its context, session parameters, variables, temporary objects or an
+# open transaction; sessions that ran one are closed rather than re-used
+SESSION_STATE_RE = re.compile(
+    r"^(\s*(--[^\n]*\n|/\*[\s\S]*?\*/))*\s*"  # leading comments
+    r"(use|set|unset|alter\s+session|begin|start\s+transaction|"
+    r"create\s+(or\s+replace\s+)?(local\s+|global\s+)?"
+    r"(temp|temporary|volatile))\b", re.IGNORECASE)
+
+# Session context compared against the credentials a session was opened with
+CONTEXT_ATTRS = ('role', 'warehouse', 'database', 'schema')
+
+
+def changes_session(sql: str) -> bool:
+    """Checks whether a statement leaves state on the session it runs on."""
+    return bool(SESSION_STATE_RE.match(sql))
+
+
+class ConnectionPool:
+    """Thread-safe pool of open sessions keyed by credential set.
+
+    Sessions are checked out for exclusive use and checked back in when the
+    caller is done with them; a new session is only opened when no idle one
+    exists for the credential set and fewer than ``max_size`` are open.
+    Once ``max_size`` are checked out, a caller waits up to ``timeout``
+    seconds for one to be checked in before an unpooled session, closed on
+    check-in, is opened for it instead.
+
+    Sessions checked in with a role, warehouse, database or schema other
+    than their credentials' are closed rather than re-used.
+
+    Args:
+        max_size: Maximum number of open sessions (idle and checked out
+            combined) per credential set.
+        idle_timeout: Number of seconds after which an idle session is
+            closed and removed from the pool.
+        ping_after: Number of seconds a session can sit idle before it is
+            verified with a round trip to the warehouse on checkout.
+        timeout: Default number of seconds to wait for a session when
+            ``max_size`` are checked out.
+
+    """
+    def __init__(self, max_size: int = 8, idle_timeout: float = 600,
+                 ping_after: float = 60,
+                 timeout: float = CHECKOUT_TIMEOUT) -> None:
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.ping_after = ping_after
+        self.timeout = timeout
+
+        self._lock = threading.Condition()
+        self._idle = {}  # key: [(conn, time checked in), ...]
+        self._open = {}  # key: count of open sessions
+        self._overflow = set()  # ids of unpooled sessions checked out
+
+    @staticmethod
+    def key(credentials: dict) -> tuple:
+        """Hashable key identifying a set of credentials."""
+        return tuple(sorted(credentials.items()))
+
+    def is_alive(self, conn: snowflake.connector, idle_for: float) -> bool:
+        """Checks that a session is open and, if idle a while, responsive."""
+        try:
+            if conn.is_closed():
+                return False
+            if idle_for > self.ping_after:
+                conn.cursor().execute('select 1').close()
+            return True
+        except Exception:
+            return False
+
+    def checkout(self, key: tuple, connect, timeout: float = None,
+                 fresh: bool = False) -> snowflake.connector:
+        """Borrows a live session for ``key``, opening one if needed.
+
+        Args:
+            key: Credential set key as returned by :meth:`key`
+            connect: Callable that opens and returns a new session
+            timeout: Number of seconds to wait for a session to be checked
+                in when ``max_size`` are already open before opening an
+                unpooled session; defaults to the pool's ``timeout``
+            fresh: Boolean value indicating whether or not to open a new
+                session rather than re-use an idle one
+        Returns:
+            snowflake.connector.conn object
+
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self._lock:
+                expired = self._evict_idle()
+                idle = None if fresh else self._idle.get(key)
+                overflow = False
+
+                if idle:
+                    conn, checked_in = idle.pop()
+
+                elif self._open.get(key, 0) < self.max_size:
+                    self._open[key] = self._open.get(key, 0) + 1
+                    conn = None
+
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining > 0:
+                        self._lock.wait(remaining)
+                        continue
+                    overflow = True
+
+            self._close(expired)
+
+            if overflow:
+                print(f"<no pooled session checked in within {timeout}s "
+                      f"({self.max_size} checked out) - opening an unpooled "
+                      f"session>")
+                conn = connect()
+                with self._lock:
+                    self._overflow.add(id(conn))
+                return conn
+
+            if conn is None:
+                try:
+                    return connect()
+                except Exception:
+                    self._forget(key)
+                    raise
+
+            if self.is_alive(conn, time.monotonic() - checked_in):
+                return conn
+
+            self.discard(key, conn)
+
+    def checkin(self, key: tuple, conn: snowflake.connector) -> None:
+        """Returns a checked out session to the pool for re-use.
+
+        Unpooled sessions and sessions whose context no longer matches
+        their credentials are closed instead.
+        """
+        if self._release_overflow(conn):
+            return None
+
+        try:
+            closed = conn.is_closed()
+        except Exception:
+            closed = True
+
+        if closed:
+            self._forget(key)
+            return None
+
+        if not self.in_context(key, conn):
+            self.discard(key, conn)
+            return None
+
+        with self._lock:
+            self._idle.setdefault(key, []).append((conn, time.monotonic()))
+            self._lock.notify()
+
+        return None
+
+    def discard(self, key: tuple, conn: snowflake.connector) -> None:
+        """Closes a checked out session instead of returning it to the pool."""
+        self._close([conn])
+        if not self._release_overflow(conn):
+            self._forget(key)
+        return None
+
+    @staticmethod
+    def in_context(key: tuple, conn: snowflake.connector) -> bool:
+        """Checks that a session's role, warehouse, database and schema are
+        still those of the credentials it was opened with."""
+        credentials = dict(key)
+        for attr in CONTEXT_ATTRS:
+            current, expected = getattr(conn, attr, None), \
+                credentials.get(attr)
+            if current and expected and \
+                    current.strip('"').upper() != expected.strip('"').upper():
+                return False
+
+        return True
+
+    def _release_overflow(self, conn: snowflake.connector) -> bool:
+        """Closes a session if it was opened outside the pool.
+
+        Returns:
+            Boolean value indicating whether or not the session was unpooled
+        """
+        with self._lock:
+            if id(conn) not in self._overflow:
+                return False
+            self._overflow.discard(id(conn))
+
+        self._close([conn])
+        return True
+
+    def close_all(self) -> None:
+        """Closes all idle sessions in the pool."""
+        with self._lock:
+            idle = [conn for sessions in self._idle.values()
+                    for conn, _ in sessions]
+            for key, sessions in self._idle.items():
+                self._open[key] -= len(sessions)
+            self._idle.clear()
+            self._lock.notify_all()
+
+        self._close(idle)
+        return None
+
+    def _evict_idle(self) -> list:
+        """Removes sessions idle beyond ``idle_timeout``; call with lock held.
+
+        Returns:
+            List of evicted sessions to be closed once the lock is released
+
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = []
+        for key, sessions in self._idle.items():
+            stale = [conn for conn, checked_in in sessions
+                     if checked_in < cutoff]
+            if stale:
+                sessions[:] = [(conn, checked_in) for conn, checked_in in
+                               sessions if checked_in >= cutoff]
+                self._open[key] -= len(stale)
+                expired += stale
+
+        if expired:
+            self._lock.notify_all()
+
+        return expired
+
+    def _forget(self, key: tuple) -> None:
+        """Frees the slot of a session that is no longer open."""
+        with self._lock:
+            self._open[key] = max(self._open.get(key, 0) - 1, 0)
+            self._lock.notify()
+
+        return None
+
+    @staticmethod
+    def _close(conns: list) -> None:
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+        return None
+
+
+pool = ConnectionPool()
+atexit.register(pool.close_all)
+
+
 class Connection(creds.Credentials):
     """Instantiate with inherited attributes from snowcreds.
 
@@ -15,34 +285,88 @@ class Connection(creds.Credentials):
         conn_name: Name of connection within json file to use - it will
             use first set of credentials in the file if no argument is
             passed.
+        pool: ConnectionPool to borrow sessions from.
 
     """
     def __init__(self, config_file: str = 'snowflake_credentials.json',
-                 conn_name: str = '', cache=cache):
-        super().__init__()
+                 conn_name: str = '', cache=cache, pool=pool):
+        super().__init__(config_file=config_file, conn_name=conn_name,
+                         cache=cache)
 
         self.config_file = config_file
         self.conn_name = conn_name
         self.cache = cache
+        self.pool = pool
+        self.conn = None
+        self.session_changed = False
 
-    def get_conn(self) -> snowflake.connector:
-        """Uses credentials to authenticate for statement execution.
+    def connect(self) -> snowflake.connector:
+        """Uses credentials to authenticate a new session.
 
         Returns:
             snowflake.connector.conn object
 
         """
-
-        self.credentials = creds.Credentials(config_file=self.config_file,
-                                             conn_name=self.conn_name,
-                                             cache=self.cache).get()
-        self.conn = snowflake.connector.connect(
+        return snowflake.connector.connect(
             user=self.credentials["username"],
             password=self.credentials["password"],
             role=self.credentials["role"],
             account=self.credentials["account"],
             warehouse=self.credentials["warehouse"],
             database=self.credentials["database"],
-            schema=self.credentials["schema"])
+            schema=self.credentials["schema"],
+            client_session_keep_alive=KEEP_ALIVE,
+            client_session_keep_alive_heartbeat_frequency=HEARTBEAT_FREQUENCY,
+            paramstyle=PARAMSTYLE)
+
+    def get_conn(self, fresh: bool = False) -> snowflake.connector:
+        """Borrows a session for statement execution from the pool.
+
+        A new session is only authenticated if the pool has no idle session
+        for the same set of credentials.
+
+        Args:
+            fresh: Boolean value indicating whether or not to authenticate a
+                new session even if an idle one is available
+
+        Returns:
+            snowflake.connector.conn object
+
+        """
+
+        reader = creds.Credentials(config_file=self.config_file,
+                                   conn_name=self.conn_name,
+                                   cache=self.cache)
+        self.credentials = reader.get()
+        self.resolved_conn_name = reader.conn_name
+        self.pool_key = self.pool.key(self.credentials)
+        self.conn = self.pool.checkout(self.pool_key, self.connect,
+                                       fresh=fresh)
 
         return self.conn
+
+    def release(self, close: bool = False) -> None:
+        """Returns the borrowed session to the pool.
+
+        Sessions that ran a statement leaving state on them, as recorded in
+        ``session_changed``, are closed rather than re-used so that the next
+        borrower doesn't inherit that state.
+
+        Args:
+            close: Boolean value indicating whether or not to close the
+                session rather than make it available for re-use
+
+        """
+        if self.conn is None:
+            return None
+
+        close = close or self.session_changed
+        self.session_changed = False
+
+        if close:
+            self.pool.discard(self.pool_key, self.conn)
+        else:
+            self.pool.checkin(self.pool_key, self.conn)
+        self.conn = None
+
+        return None
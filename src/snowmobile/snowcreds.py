@@ -1,9 +1,46 @@
 import os
 import json
+import time
+import threading
+from collections import deque
 from fcache.cache import FileCache
 
 cache = FileCache('snowmobile', flag='cs')
 
+# Environment variables checked before any file system traversal; the first
+# may point to the credentials file itself or to its parent directory and the
+# second is an os.pathsep-separated list of directories to check
+CONFIG_PATH_ENV = 'SNOWMOBILE_CONFIG_PATH'
+SEARCH_PATH_ENV = 'SNOWMOBILE_SEARCH_PATH'
+
+# Limits on the fallback traversal of the home directory
+MAX_SEARCH_DEPTH = 6
+SEARCH_TIME_LIMIT = 30
+
+# Directories that are never descended into when traversing the file system
+SKIP_DIRS = {'.git', '.hg', '.svn', 'node_modules', '__pycache__', '.tox',
+             '.nox', '.venv', 'venv', 'env', '.env', 'site-packages',
+             '.cache', '.conda', 'anaconda3', 'miniconda3', '.npm', '.cargo',
+             '.rustup', '.Trash', 'AppData', 'Library'}
+
+# Process-wide store of parsed credentials keyed by (config_file, conn_name)
+# with values of (path_to_config, mtime, conn_name, all_creds); entries are
+# only used while the mtime of the file they were parsed from is unchanged
+_store = {}
+_store_lock = threading.Lock()
+
+# Paths to config files already located in this process keyed by file name
+_located = {}
+
+
+def clear_store() -> None:
+    """Clears in-process credentials so the next lookup re-reads from disk."""
+    with _store_lock:
+        _store.clear()
+        _located.clear()
+
+    return None
+
 
 class Credentials:
 
@@ -21,11 +58,15 @@ class Credentials:
         self.cache = cache
         self.config_file = config_file
         self.conn_name = conn_name.lower()
-        self.path_to_config = self.cache.get(r'path_to_config')
+        self.path_to_config = self.explicit_path() or \
+            _located.get(self.config_file) or \
+            self.cache.get('config_index', {}).get(self.config_file) or \
+            self.cache.get(r'path_to_config')
 
     def clear_cache(self) -> object:
         """Clears cached path to credentials file."""
         self.cache.clear()
+        clear_store()
         return self
 
     def cache_exists(self) -> bool:
@@ -42,17 +83,112 @@ class Credentials:
         except:
             return False
 
-    def locate_config(self):
-        """Find config file by traversing file system from bottom up."""
-        for dirpath, dirnames, files in os.walk(os.path.expanduser('~'),
-                                                topdown=False):
-            if self.config_file in files:
+    def env_paths(self) -> list:
+        """Locations of the config file set through environment variables.
+
+        Returns:
+            List of candidate file paths built from the SNOWMOBILE_CONFIG_PATH
+            and SNOWMOBILE_SEARCH_PATH environment variables.
+
+        """
+        candidates = []
+
+        explicit = os.environ.get(CONFIG_PATH_ENV, '')
+        if explicit:
+            explicit = os.path.expanduser(explicit)
+            if os.path.isdir(explicit):
+                explicit = os.path.join(explicit, self.config_file)
+            candidates.append(explicit)
+
+        dirs = [d for d in os.environ.get(SEARCH_PATH_ENV, '').split(
+            os.pathsep) if d]
+        candidates += [os.path.join(os.path.expanduser(d), self.config_file)
+                       for d in dirs]
+
+        return candidates
+
+    def explicit_path(self) -> str:
+        """First existing config file set through environment variables.
+
+        Takes precedence over any path located, indexed or stored earlier so
+        that pointing the environment variables at another file takes effect
+        immediately.
+
+        Returns:
+            Full path to the config file or an empty string if none is set
+
+        """
+        return next((path for path in self.env_paths()
+                     if os.path.isfile(path)), '')
+
+    def search_paths(self) -> list:
+        """Explicit locations to check for the config file before traversing.
+
+        Returns:
+            List of candidate file paths from :meth:`env_paths` followed by
+            the current working directory and the home directory.
+
+        """
+        return self.env_paths() + [
+            os.path.join(d, self.config_file)
+            for d in (os.getcwd(), os.path.expanduser('~'))]
+
+    def walk_for_config(self, root: str, max_depth: int = MAX_SEARCH_DEPTH,
+                        time_limit: float = SEARCH_TIME_LIMIT) -> str:
+        """Breadth-first search for the config file beneath ``root``.
+
+        Directories in SKIP_DIRS and virtual environments are pruned, symlinks
+        are not followed and the search gives up once either ``max_depth``
+        or ``time_limit`` (seconds) is exceeded.
+
+        Args:
+            root: Directory to begin the search from
+            max_depth: Number of directory levels below ``root`` to search
+            time_limit: Number of seconds after which to abandon the search
+        Returns:
+            Full path to the config file or an empty string if not found
+
+        """
+        deadline = time.monotonic() + time_limit
+        queue = deque([(root, 0)])
 
-                self.path_to_config = os.path.join(dirpath, self.config_file)
+        while queue:
+            if time.monotonic() > deadline:
+                print(f"\t<search stopped after {time_limit}s>")
                 break
 
-            else:
-                self.path_to_config = ''
+            path, depth = queue.popleft()
+            subdirs = []
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.name == self.config_file and \
+                                entry.is_file(follow_symlinks=False):
+                            return entry.path
+                        if depth < max_depth and \
+                                entry.name not in SKIP_DIRS and \
+                                entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+
+            except OSError:
+                continue
+
+            queue.extend((d, depth + 1) for d in subdirs
+                         if not os.path.isfile(os.path.join(d, 'pyvenv.cfg')))
+
+        return ''
+
+    def locate_config(self) -> str:
+        """Find config file in explicit search paths, then the home directory.
+
+        Locations from :meth:`search_paths` are checked first; the home
+        directory is only traversed with :meth:`walk_for_config` if none of
+        them contain the config file.
+
+        """
+        self.path_to_config = next(
+            (path for path in self.search_paths() if os.path.isfile(path)),
+            '') or self.walk_for_config(os.path.expanduser('~'))
 
         return self.path_to_config
 
@@ -60,8 +196,16 @@ class Credentials:
         """Checks for cache existence and validates - traverses OS if not."""
         print("Locating credentials...")
 
+        explicit = self.explicit_path()
+
         print("\t<1 of 2> Checking for cached path...")
-        if self.cache_exists() and self.cache_valid_for_config():
+        if explicit:
+            self.path_to_config = explicit
+
+            print(f"\t<2 of 2> Found path set by {CONFIG_PATH_ENV} or "
+                  f"{SEARCH_PATH_ENV}: {self.path_to_config}")
+
+        elif self.cache_exists() and self.cache_valid_for_config():
 
             print(f"\t<2 of 2> Found cached path: {self.path_to_config}")
 
@@ -84,17 +228,62 @@ class Credentials:
 
         return self.path_to_config
 
+    def from_store(self) -> bool:
+        """Loads credentials parsed earlier in the process if still current.
+
+        Returns:
+            Boolean indicating whether or not a stored set of credentials was
+            found whose config file has not been modified since it was parsed
+            and is still the one set through environment variables, if any
+
+        """
+        with _store_lock:
+            stored = _store.get((self.config_file, self.conn_name))
+
+        if not stored:
+            return False
+
+        path, mtime, conn_name, all_creds = stored
+        explicit = self.explicit_path()
+        if explicit and os.path.abspath(explicit) != os.path.abspath(path):
+            return False
+
+        try:
+            if os.stat(path).st_mtime != mtime:
+                return False
+        except OSError:
+            return False
+
+        self.path_to_config = path
+        self.conn_name = conn_name
+        self.all_creds = all_creds
+        self.creds = all_creds[conn_name]
+
+        return True
+
     def get(self) -> dict:
         """Locates creds file and parses out the specified set of credentials.
 
+        Credentials already parsed in the current process are returned from
+        memory unless the config file has been modified since.
+
         Returns:
             Dictionary containing a specific set of Snowflake credentials
 
         """
+        key = (self.config_file, self.conn_name)
+        if self.from_store():
+            return self.creds
+
         self.path_to_config = self.get_creds_path()
         self.cache['path_to_config'] = self.path_to_config
+        if self.path_to_config:
+            index = self.cache.get('config_index', {})
+            index[self.config_file] = self.path_to_config
+            self.cache['config_index'] = index
 
         try:
+            mtime = os.stat(self.path_to_config).st_mtime
             with open(self.path_to_config) as c:
                 temp = json.load(c)
                 # print(temp)
@@ -126,6 +315,11 @@ class Credentials:
             print(f"\t<2 of 2> Successfully imported credentials for "
                   f"'{self.conn_name}'")
 
+            with _store_lock:
+                _located[self.config_file] = self.path_to_config
+                _store[key] = (self.path_to_config, mtime, self.conn_name,
+                               self.all_creds)
+
 
         # except IOError as e:
         else:
@@ -138,3 +332,14 @@ class Credentials:
             # print(e)
 
         return self.creds
+
+    def connection_names(self) -> list:
+        """Names of all connections within the config file.
+
+        Returns:
+            List of lower-cased connection names in the order they appear in
+            the config file
+
+        """
+        self.get()
+        return list(self.all_creds)
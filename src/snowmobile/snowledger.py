@@ -0,0 +1,170 @@
+import os
+import hashlib
+import sqlite3
+import datetime
+import threading
+import pandas as pd
+
+# Location of the default ledger, which can be overridden by setting the
+# SNOWMOBILE_LEDGER environment variable to a file path
+LEDGER_ENV = 'SNOWMOBILE_LEDGER'
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.snowmobile',
+                            'ledger.sqlite')
+
+SCHEMA = [
+    """create table if not exists queries (
+        executed_at text,
+        sql_hash text,
+        sfqid text,
+        conn_name text,
+        wall_time real,
+        fetch_time real,
+        rows integer,
+        result_bytes integer
+    )""",
+    """create table if not exists statements (
+        sql_hash text primary key,
+        sql text
+    )""",
+    "create index if not exists queries_sql_hash on queries (sql_hash)",
+]
+
+SUMMARY = """select
+        q.sql_hash
+        ,count(*) as executions
+        ,avg(q.wall_time) as avg_wall_time
+        ,max(q.wall_time) as max_wall_time
+        ,sum(q.wall_time) as total_wall_time
+        ,avg(q.fetch_time) as avg_fetch_time
+        ,avg(q.rows) as avg_rows
+        ,avg(q.result_bytes) as avg_result_bytes
+        ,max(q.executed_at) as last_executed_at
+        ,s.sql
+    from queries q
+    left join statements s on s.sql_hash = q.sql_hash
+    where q.executed_at >= ?
+    group by q.sql_hash, s.sql
+    order by {order_by} desc
+    limit ?"""
+
+
+def sql_hash(sql: str) -> str:
+    """Hash identifying a statement by its whitespace-normalized text."""
+    return hashlib.sha1(' '.join(sql.split()).encode()).hexdigest()
+
+
+class Ledger:
+    """Local, append-only SQLite record of every statement executed.
+
+    Each execution records its wall time, the portion of it spent fetching
+    results, the row count, the in-memory size of the results, the query
+    id, the connection name and a hash of the SQL; the SQL itself is
+    stored once per hash.
+
+    .. code-block:: python
+
+        from snowmobile import snowledger
+
+        snowledger.ledger.slowest(10)
+        snowledger.ledger.most_frequent(10)
+
+    Args:
+        path: Path to the SQLite database, created on first use.
+
+    """
+    def __init__(self, path: str = ''):
+        self.path = path or os.environ.get(LEDGER_ENV, DEFAULT_PATH)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._failed = False
+
+    def connect(self) -> sqlite3.Connection:
+        """Opens the database, creating it and its tables if needed."""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)),
+                        exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30,
+                                   check_same_thread=False)
+            conn.execute('pragma journal_mode = wal')
+            conn.execute('pragma synchronous = normal')
+            for statement in SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+            self._conn = conn
+
+        return self._conn
+
+    def record(self, sql: str, sfqid: str = '', conn_name: str = '',
+               wall_time: float = None, fetch_time: float = None,
+               rows: int = None, result_bytes: int = None) -> None:
+        """Appends an execution to the ledger.
+
+        Failures to write are reported once and otherwise ignored so that
+        the ledger can never interrupt statement execution.
+
+        """
+        digest = sql_hash(sql)
+        executed_at = datetime.datetime.now().isoformat(sep=' ')
+
+        try:
+            with self._lock:
+                conn = self.connect()
+                conn.execute('insert or ignore into statements values (?, ?)',
+                             (digest, sql))
+                conn.execute('insert into queries values (?, ?, ?, ?, ?, ?, '
+                             '?, ?)', (executed_at, digest, sfqid, conn_name,
+                                       wall_time, fetch_time, rows,
+                                       result_bytes))
+                conn.commit()
+
+        except (sqlite3.Error, OSError) as e:
+            if not self._failed:
+                print(f"<could not record to ledger at {self.path}: {e}>")
+                self._failed = True
+
+        return None
+
+    def summary(self, order_by: str = 'avg_wall_time', n: int = 10,
+                since: str = '') -> pd.DataFrame:
+        """Per-statement summary of executions.
+
+        Args:
+            order_by: Summary column to rank statements by, such as
+                'avg_wall_time', 'total_wall_time', 'executions' or
+                'avg_result_bytes'
+            n: Number of statements to return
+            since: ISO-formatted date or timestamp before which executions
+                are ignored
+        Returns:
+            DataFrame with one row per statement
+
+        """
+        allowed = ('executions', 'avg_wall_time', 'max_wall_time',
+                   'total_wall_time', 'avg_fetch_time', 'avg_rows',
+                   'avg_result_bytes', 'last_executed_at')
+        if order_by not in allowed:
+            raise ValueError(f"order_by must be one of {allowed}, "
+                             f"not '{order_by}'")
+
+        with self._lock:
+            return pd.read_sql(SUMMARY.format(order_by=order_by),
+                               self.connect(), params=(since, n))
+
+    def slowest(self, n: int = 10, since: str = '') -> pd.DataFrame:
+        """Statements with the highest average wall time."""
+        return self.summary('avg_wall_time', n=n, since=since)
+
+    def most_frequent(self, n: int = 10, since: str = '') -> pd.DataFrame:
+        """Statements executed the most times."""
+        return self.summary('executions', n=n, since=since)
+
+    def history(self, n: int = 100) -> pd.DataFrame:
+        """Most recent executions, latest first."""
+        with self._lock:
+            return pd.read_sql(
+                'select q.*, s.sql from queries q left join statements s '
+                'on s.sql_hash = q.sql_hash order by q.rowid desc limit ?',
+                self.connect(), params=(n,))
+
+
+ledger = Ledger()
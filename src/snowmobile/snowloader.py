@@ -1,14 +1,95 @@
 
 from snowmobile import snowquery
+from typing import Iterator
+from collections import deque
+from concurrent import futures
+import numpy as np
 import pandas as pd
+import functools
 import string
+import multiprocessing
+import tempfile
+import shutil
+import glob
+import time
+import threading
+import gzip
+import io
 import os
 import itertools
 import csv
 import datetime
+import uuid
 import re
 
-
+# Staging file formats; csv files are loaded with the user-defined file
+# format passed to df_to_snowflake and parquet files with the inline format
+# below, matching columns to the table's by name
+LOAD_FILE_TYPES = ('csv', 'parquet')
+PARQUET_FORMAT = "type = parquet"
+PART_SUFFIXES = {'csv': '.csv.gz', 'parquet': '.parquet'}
+
+# Punctuation other than underscores, replaced with underscores in column
+# names through a translation table built once rather than per column
+INVALID_PUNCT = ''.join(punct for punct in string.punctuation
+                        if punct != '_')
+REPL_INVALID_PUNCT = str.maketrans(INVALID_PUNCT, '_' * len(INVALID_PUNCT))
+REPEATABLE_CHARS = frozenset(string.punctuation + string.whitespace)
+
+# SQL types given to object columns in generated DDL by the
+# pd.api.types.infer_dtype of the full column, as pandas maps them; any
+# other inferred type is given TEXT
+OBJECT_SQL_TYPES = {
+    'string': 'TEXT',
+    'floating': 'REAL',
+    'integer': 'INTEGER',
+    'datetime': 'TIMESTAMP',
+    'datetime64': 'TIMESTAMP',
+    'date': 'DATE',
+    'time': 'TIME',
+    'boolean': 'INTEGER',
+    'timedelta64': 'INTEGER',
+}
+
+# Number of seconds columns of a table looked up in INFORMATION_SCHEMA are
+# re-used for before being looked up again; tables that don't exist and
+# tables the loader issues DDL against are looked up again regardless
+TABLE_CACHE_TTL = 600
+
+# Columns of tables looked up in this process keyed by (connection name,
+# database, schema, table name) with the time they were looked up
+_table_cols = {}
+_table_cols_lock = threading.Lock()
+
+# Start method of the processes that serialize part files; forked processes
+# would inherit the connector's heartbeat threads and the loader's own
+# threads mid-operation, so workers are started fresh instead, which
+# requires scripts that load in parts to do so beneath an
+# ``if __name__ == '__main__':`` guard
+PROCESS_START_METHOD = 'spawn'
+
+# Files on a managed stage older than STAGE_FILE_MAX_AGE seconds are left
+# over from failed loads, and are removed by a background thread started at
+# most once every STAGE_GC_INTERVAL seconds per stage
+STAGE_FILE_MAX_AGE = 24 * 3600
+STAGE_GC_INTERVAL = 3600
+
+# Managed stages known to exist in this process keyed by (connection name,
+# database, schema, stage name) with the time they were last collected
+_managed_stages = {}
+_managed_stages_lock = threading.Lock()
+
+# Rows formatted to csv at a time, bounding the size of the copy made to add
+# a LOADED_TMSTMP field to them
+CSV_SLICE_ROWS = 100000
+
+# Rows per part when loading from memory without an explicit chunk_rows, so
+# that compressing later parts overlaps with uploading earlier ones and no
+# single buffer holds the whole compressed DataFrame
+IN_MEMORY_CHUNK_ROWS = 250000
+
+
+@functools.lru_cache(maxsize=2 ** 16)
 def standardize_col(col: str) -> str:
     """Standardize a column for Snowflake table.
 
@@ -17,6 +98,9 @@ def standardize_col(col: str) -> str:
     (2) Replaces special characters with underscores
     (3) Reduces repeated special characters
 
+    Results are memoized, so standardizing the same names across loads
+    costs a lookup.
+
     Args:
         col: A single string value of a column name
     Returns:
@@ -26,16 +110,12 @@ def standardize_col(col: str) -> str:
     """
     col = ((col.replace(' ', '_')).strip('_')).upper()  # 1
 
-    invalid_punct = [punct for punct in string.punctuation if
-                     punct != '_']  # 2
-    repl_invalid_punct = str.maketrans(''.join(invalid_punct),
-                                       '_' * len(invalid_punct))
-    col = ''.join(col.translate(repl_invalid_punct))
+    col = col.translate(REPL_INVALID_PUNCT)  # 2
 
     new_chars = []  # 3
 
     for k, v in itertools.groupby(col):
-        if k in string.punctuation or k in string.whitespace:
+        if k in REPEATABLE_CHARS:
             new_chars.append(k)
 
         else:
@@ -48,57 +128,231 @@ def standardize_col(col: str) -> str:
     return col
 
 
+def without_loaded_tmstmp(df: pd.DataFrame) -> pd.DataFrame:
+    """Drops any column of a DataFrame that would be loaded as *LOADED_TMSTMP*.
+
+    The loader adds its own *LOADED_TMSTMP* field, which replaces any column
+    whose standardized name is the same; ``df`` itself is returned if it
+    has no such column.
+
+    Args:
+        df: DataFrame to load
+    Returns:
+        ``df`` without columns loaded as *LOADED_TMSTMP*
+    """
+    existing = [col for col in df.columns
+                if standardize_col(col) == 'LOADED_TMSTMP']
+
+    return df.drop(columns=existing) if existing else df
+
+
+def snowflake_columns(columns: list) -> list:
+    """Standardized names of columns as loaded, including *LOADED_TMSTMP*.
+
+    Args:
+        columns: Column names of the DataFrame to load
+    Returns:
+        List of standardized column names with *LOADED_TMSTMP* on the far
+        right side in place of any column of the same name
+    """
+    names = [standardize_col(col) for col in columns]
+
+    return [name for name in names if name != 'LOADED_TMSTMP'] + \
+        ['LOADED_TMSTMP']
+
+
+def load_template(df: pd.DataFrame) -> pd.DataFrame:
+    """Empty frame with the columns & dtypes of a DataFrame as loaded.
+
+    ``df`` is neither copied nor modified, so that a table can be validated
+    from column metadata alone; DDL generated from the template needs the
+    types of object columns from :func:`object_sql_types`.
+
+    Args:
+        df: pd.DataFrame to be pushed to Snowflake
+    Returns:
+        pd.DataFrame with re-formatted column names and a *LOADED_TMSTMP*
+        field added on the far right side
+    """
+    template = without_loaded_tmstmp(df.head(0))
+    return template.assign(LOADED_TMSTMP=pd.Series(
+        index=template.index, dtype='datetime64[ns]')).set_axis(
+        snowflake_columns(df.columns), axis=1)
+
+
+def object_sql_types(df: pd.DataFrame) -> dict:
+    """SQL types of the object columns of a DataFrame in generated DDL.
+
+    Types are inferred from every value of each column, as they would be by
+    :func:`get_ddl` given the full DataFrame; columns replaced by the
+    loader's *LOADED_TMSTMP* field are skipped rather than dropped, so that
+    the DataFrame isn't copied.
+
+    Args:
+        df: pd.DataFrame to be pushed to Snowflake
+    Returns:
+        Dictionary of standardized column names to SQL types
+    """
+    types = {}
+    for i, (col, dtype) in enumerate(df.dtypes.items()):
+        name = standardize_col(col)
+        if dtype == object and name != 'LOADED_TMSTMP':
+            inferred = pd.api.types.infer_dtype(df.iloc[:, i], skipna=True)
+            types[name] = OBJECT_SQL_TYPES.get(inferred, 'TEXT')
+
+    return types
+
+
 def rename_cols_for_snowflake(df: pd.DataFrame) -> pd.DataFrame:
     """Renaming DataFrame columns for Snowflake table.
 
+    The DataFrame passed is not modified; loads validate against
+    :func:`load_template` rather than a renamed copy of the full frame.
+
     Args:
         df: pd.DataFrame to be pushed to Snowflake
     Returns:
         pd.DataFrame with re-formatted column names and a *loaded_tmstmp*
         field added on the far right side
     """
-    df['LOADED_TMSTMP'] = datetime.datetime.now()
-    old_cols = list(df.columns)
-    new_cols = [standardize_col(val) for val in df.columns]
-    new_col_map = {k: v for k, v in zip(old_cols, new_cols)}
-    df = df.rename(columns=new_col_map)
-    return df
+    return without_loaded_tmstmp(df).assign(
+        LOADED_TMSTMP=datetime.datetime.now()).set_axis(
+        snowflake_columns(df.columns), axis=1)
 
 
-def get_ddl(df: pd.DataFrame, table_name: str) -> str:
+def get_ddl(df: pd.DataFrame, table_name: str, dtype: dict = None) -> str:
     """Gets DDL for a table given a DataFrame.
 
     Args:
-        df: pd.DataFrame to push to Snowflake.
+        df: pd.DataFrame to push to Snowflake, or a :func:`load_template`
+            of it
         table_name: Name of table to load the DataFrame into.
+        dtype: SQL types of columns to use in place of inferring them, such
+            as the :func:`object_sql_types` of a DataFrame whose template
+            is passed
     Returns:
         DDL to be executed to create table structure to load DataFrame into
         (for force-recreation of a table or loading into a table that
         doesn't previously exist)
     """
-    return pd.io.sql.get_schema(df, table_name).replace('CREATE TABLE',
-                                                     'CREATE OR REPLACE TABLE')
+    return pd.io.sql.get_schema(df, table_name, dtype=dtype).replace(
+        'CREATE TABLE', 'CREATE OR REPLACE TABLE')
+
+
+def _table_key(table_name: str, snowflake: snowquery.Connector) -> tuple:
+    """Key of a table's columns within the table cache."""
+    database, schema = snowflake._session_context()[2:]
+    return (getattr(snowflake, 'resolved_conn_name', snowflake.conn_name),
+            database, schema, table_name)
+
+
+def invalidate_table(table_name: str = '') -> None:
+    """Drops cached columns of a table, or of all tables if none is passed.
+
+    Args:
+        table_name: Name of the table to look up again on its next load
+    Returns:
+        None
+    """
+    with _table_cols_lock:
+        for key in [key for key in _table_cols
+                    if not table_name or key[-1] == table_name]:
+            del _table_cols[key]
+
+    return None
+
+
+def prefetch_tables(table_names: list,
+                    snowflake: snowquery.Connector) -> dict:
+    """Looks up the columns of many tables with a single metadata query.
+
+    Columns are cached so that loads into any of the tables in the next
+    ``TABLE_CACHE_TTL`` seconds don't query INFORMATION_SCHEMA themselves;
+    tables that don't exist aren't cached, as they may be created by
+    others before they're loaded into.
+
+    .. code-block:: python
+
+        snowloader.prefetch_tables(list(dfs_to_load), sf)
+        for table_name, df in dfs_to_load.items():
+            snowloader.df_to_snowflake(df, table_name, connector=sf)
+
+    Args:
+        table_names: Names of the tables to look up
+        snowflake: snowquery.Connector object to execute statement with
+    Returns:
+        Dictionary of {table name: columns} with an empty list for each
+        table that does not exist
+    """
+    table_names = list(dict.fromkeys(table_names))
+    if not table_names:
+        return {}
+
+    placeholders = ', '.join('?' for _ in table_names)
+    sql = f"""SELECT
+                TABLE_NAME
+                ,ORDINAL_POSITION
+                ,COLUMN_NAME
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_NAME IN ({placeholders})
+            ORDER BY 1 ASC, 2 ASC"""
+
+    validation_df = snowflake.execute_query(sql, use_cache=False,
+                                            params=table_names)
+    if not snowflake.sfqid:  # only recorded if the statement succeeded
+        return {}
+
+    tables = {table_name: [] for table_name in table_names}
+    for table_name, col in zip(validation_df['TABLE_NAME'],
+                               validation_df['COLUMN_NAME']):
+        tables[table_name].append(col)
+
+    looked_up = time.time()
+    with _table_cols_lock:
+        for table_name, table_cols in tables.items():
+            if table_cols:
+                _table_cols[_table_key(table_name, snowflake)] = \
+                    (table_cols, looked_up)
+
+    return {table_name: list(table_cols)
+            for table_name, table_cols in tables.items()}
 
 
 def check_information_schema(table_name: str,
-                             snowflake: snowquery.Connector) -> list:
+                             snowflake: snowquery.Connector,
+                             use_cache: bool = True) -> list:
     """Checks information schema for existence of table & returns columns
     for comparison to local DataFrame if so.
 
+    Columns looked up within the last ``TABLE_CACHE_TTL`` seconds, either
+    here or by :func:`prefetch_tables`, are re-used without a query; a table
+    found not to exist is always looked up again, so that one created since
+    isn't replaced by the loader.
+
     Args:
         table_name: Name of table to load the df into
         snowflake: snowquery.Connector object to execute statement with
+        use_cache: Boolean value indicating whether or not to re-use
+            columns looked up earlier in the process
     Returns:
         Columns of the table within database or an empty list if not
     """
+    key = _table_key(table_name, snowflake)
 
-    sql = f"""SELECT
+    if use_cache:
+        with _table_cols_lock:
+            cached = _table_cols.get(key)
+        if cached and time.time() - cached[1] < TABLE_CACHE_TTL:
+            return list(cached[0])
+
+    sql = """SELECT
                 ORDINAL_POSITION
                 ,COLUMN_NAME
-            FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = '{table_name}'
+            FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = ?
             ORDER BY 1 ASC"""
 
-    validation_df = snowflake.execute_query(sql)
+    validation_df = snowflake.execute_query(sql, use_cache=False,
+                                            params=[table_name])
 
     try:
         table_cols = list(validation_df['COLUMN_NAME'])
@@ -106,7 +360,12 @@ def check_information_schema(table_name: str,
     except:
         table_cols = []
 
-    return table_cols
+    # Failed lookups and tables that don't exist aren't cached
+    if snowflake.sfqid and table_cols:
+        with _table_cols_lock:
+            _table_cols[key] = (table_cols, time.time())
+
+    return list(table_cols)
 
 
 def compare_fields(df_cols: list, table_cols: list) -> int:
@@ -183,19 +442,19 @@ def verify_load(df: pd.DataFrame, snowflake: snowquery.Connector,
     """
     print(f"<validating load into {table_name}>")
 
-    df = rename_cols_for_snowflake(df)
+    template = load_template(df)
 
-    table_exists, fields_match = validate_table(df, table_name,
+    table_exists, fields_match = validate_table(template, table_name,
                                                 snowflake=snowflake)
 
-    table_ddl = get_ddl(df, table_name)
+    table_ddl = get_ddl(template, table_name, dtype=object_sql_types(df))
+    create_table = False
 
     if not table_exists:
         print(
             f"\tTable: {table_name} created in absence of pre-existing "
             f"table\n")
-        continue_load = True
-        snowflake.execute_query(table_ddl)
+        continue_load = create_table = True
 
     elif fields_match and not force_recreate:
         print(
@@ -207,8 +466,7 @@ def verify_load(df: pd.DataFrame, snowflake: snowquery.Connector,
         print(
             f"\tTable: {table_name} Already exists w/ matching field names "
             f"- Recreated by user w/ force_recreate=True\n")
-        continue_load = True
-        snowflake.execute_query(table_ddl)
+        continue_load = create_table = True
 
     elif not force_recreate:
         print(
@@ -220,23 +478,437 @@ def verify_load(df: pd.DataFrame, snowflake: snowquery.Connector,
         print(
             f"\tTable: {table_name} columns don't match those in local "
             f"DataFrame \n- Force-recreated by user\n")
-        continue_load = True
+        continue_load = create_table = True
+
+    if create_table:
         snowflake.execute_query(table_ddl)
+        invalidate_table(table_name)
+
+        if not snowflake.sfqid:  # only recorded if the statement succeeded
+            print(f"\t<{table_name} could not be created - skipping load>\n")
+            continue_load = False
 
     return continue_load
 
 
+def stage_location(table_name: str, stage: str = '',
+                   prefix: str = '') -> str:
+    """Stage and path that a load's files are uploaded to, without the @.
+
+    Args:
+        table_name: Name of the table to load, after which per-load stages
+            are named
+        stage: Name of a managed stage to use instead of a per-load stage
+        prefix: Path within the managed stage unique to the load
+    """
+    return f"{stage}/{prefix}" if stage else f"{table_name}_stage"
+
+
+def stage_statements(table_name: str, file_type: str = 'csv',
+                     file_format: str = 'csv_gem7318',
+                     on_error: str = 'continue', stage: str = '',
+                     prefix: str = '') -> tuple:
+    """Statements to create a table's stage, copy from it and drop it.
+
+    If a managed ``stage`` is passed, the stage is only created if it
+    doesn't exist, files are copied from ``prefix`` within it and purged
+    once loaded, and the files under ``prefix`` are removed in place of
+    dropping the stage.
+
+    Args:
+        table_name: Name of the table to load, after which the stage is named
+        file_type: 'csv' or 'parquet'
+        file_format: User-defined file_format within Snowflake for csv files
+        on_error: Query parameter for how to handle loading errors
+        stage: Name of a long-lived stage to load through
+        prefix: Path within ``stage`` unique to the load
+    Returns:
+        Tuple of (create stage, copy into table, drop stage) statements
+    """
+    location = stage_location(table_name, stage=stage, prefix=prefix)
+
+    stage_format = f"({PARQUET_FORMAT})" if file_type == 'parquet' \
+        else file_format
+
+    match_by_name = "match_by_column_name = case_insensitive\n" \
+        if file_type == 'parquet' else ''
+
+    if stage:
+        copy_format = PARQUET_FORMAT if file_type == 'parquet' else \
+            f"format_name = {file_format}"
+
+        create_stage = f"create stage if not exists {stage};"
+
+        copy_into = f"copy into {table_name}\n" \
+                    f"from @{location}/\n" \
+                    f"file_format = ({copy_format})\n" \
+                    f"{match_by_name}" \
+                    f"purge = true\n" \
+                    f"on_error = '{on_error}';"
+
+        drop_stage = f"remove @{location}/;"
+
+        return create_stage, copy_into, drop_stage
+
+    create_stage = \
+        f"create or replace stage {location} file_format " \
+        f"= {stage_format};"
+
+    copy_into = f"copy into {table_name}\n" \
+                f"from @{location}\n" \
+                f"{match_by_name}" \
+                f"on_error = '{on_error}';"
+
+    drop_stage = f"drop stage {location};"
+
+    return create_stage, copy_into, drop_stage
+
+
+def _stage_key(stage: str, snowflake: snowquery.Connector) -> tuple:
+    """Key of a managed stage within the stages known to exist."""
+    database, schema = snowflake._session_context()[2:]
+    return (getattr(snowflake, 'resolved_conn_name', snowflake.conn_name),
+            database, schema, stage)
+
+
+def stale_stage_files(stage: str, snowflake: snowquery.Connector,
+                      max_age: float = STAGE_FILE_MAX_AGE) -> list:
+    """Load prefixes on a managed stage holding only files older than
+    ``max_age`` seconds, which are left over from failed loads.
+
+    Args:
+        stage: Name of the managed stage
+        snowflake: snowquery.Connector object to execute statement with
+        max_age: Number of seconds after which files are considered stale
+    Returns:
+        List of paths within the stage, such as 'TABLE/<load id>'
+    """
+    listed = snowflake.execute_query(f"list @{stage};", use_cache=False)
+    if listed.empty or 'name' not in listed.columns:
+        return []
+
+    # Names are listed as '<stage>/<table>/<load id>/<file>'
+    prefixes = listed['name'].str.split('/').str[1:3].str.join('/')
+    modified = pd.to_datetime(listed['last_modified'],
+                              format='%a, %d %b %Y %H:%M:%S %Z', utc=True)
+    newest = modified.groupby(prefixes).max()
+    cutoff = pd.Timestamp.now(tz='UTC') - pd.Timedelta(seconds=max_age)
+
+    return sorted(newest[newest < cutoff].index)
+
+
+def collect_stage_garbage(stage: str, snowflake: snowquery.Connector,
+                          max_age: float = STAGE_FILE_MAX_AGE) -> int:
+    """Removes stale files left on a managed stage by failed loads.
+
+    Args:
+        stage: Name of the managed stage
+        snowflake: snowquery.Connector object to execute statements with
+        max_age: Number of seconds after which files are considered stale
+    Returns:
+        Number of load prefixes removed
+    """
+    stale = stale_stage_files(stage, snowflake, max_age=max_age)
+    for prefix in stale:
+        snowflake.execute_query(f"remove @{stage}/{prefix}/;",
+                                results=False, use_cache=False)
+
+    return len(stale)
+
+
+def _collect_in_background(stage: str, snowflake: snowquery.Connector) -> \
+        None:
+    """Collects a managed stage's garbage on its own pooled session at most
+    once every ``STAGE_GC_INTERVAL`` seconds per stage.
+
+    Stages are only collected once ``create stage`` has succeeded for them,
+    so that a stage which failed to be created isn't marked as existing.
+    """
+    key = _stage_key(stage, snowflake)
+    now = time.time()
+
+    with _managed_stages_lock:
+        if key not in _managed_stages or \
+                now - _managed_stages[key] < STAGE_GC_INTERVAL:
+            return None
+        _managed_stages[key] = now
+
+    def collect():
+        with snowquery.Connector(snowflake.config_file, snowflake.conn_name,
+                                 mode='lazy',
+                                 ledger=snowflake.ledger) as collector:
+            collect_stage_garbage(stage, collector)
+
+    threading.Thread(target=collect, daemon=True).start()
+
+    return None
+
+
+def write_csv(df: pd.DataFrame, handle,
+              loaded_tmstmp: datetime.datetime = None) -> None:
+    """Writes a DataFrame as pipe-delimited csv to an open text handle.
+
+    Rows are formatted ``CSV_SLICE_ROWS`` at a time so that adding the
+    *LOADED_TMSTMP* field copies a slice rather than the full frame; it
+    replaces any column of the same name.
+
+    Args:
+        df: DataFrame to write
+        handle: Text file-like object to write to
+        loaded_tmstmp: Value of a *LOADED_TMSTMP* field to add to each row
+    Returns:
+        None
+    """
+    for start in range(0, len(df), CSV_SLICE_ROWS):
+        rows = df.iloc[start:start + CSV_SLICE_ROWS]
+        if loaded_tmstmp is not None:
+            rows = without_loaded_tmstmp(rows).assign(
+                LOADED_TMSTMP=loaded_tmstmp)
+        rows.to_csv(handle, index=False, sep='|', header=False,
+                    quotechar='"', quoting=csv.QUOTE_ALL)
+
+    return None
+
+
+def serialize_part(df: pd.DataFrame, file_type: str = 'csv',
+                   columns: list = None,
+                   loaded_tmstmp: datetime.datetime = None) -> bytes:
+    """Serializes a slice of a DataFrame to compressed bytes in memory.
+
+    Args:
+        df: Rows of the DataFrame to serialize
+        file_type: 'csv' for a gzip-compressed CSV or 'parquet' for a
+            snappy-compressed Parquet file
+        columns: Column names to write to a Parquet file in place of the
+            DataFrame's own, excluding any loaded as *LOADED_TMSTMP*
+        loaded_tmstmp: Value of a *LOADED_TMSTMP* field to add to each row,
+            replacing any column of the same name
+    Returns:
+        Contents of the compressed file
+    """
+    buffer = io.BytesIO()
+
+    if file_type == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if loaded_tmstmp is not None:
+            # Removed from the Arrow table, which doesn't copy the others,
+            # rather than dropped from the DataFrame
+            existing = [i for i, col in enumerate(df.columns)
+                        if standardize_col(col) == 'LOADED_TMSTMP']
+            for i in reversed(existing):
+                table = table.remove_column(i)
+        if columns:
+            table = table.rename_columns(columns)
+        if loaded_tmstmp is not None:
+            table = table.append_column('LOADED_TMSTMP', pa.array(np.full(
+                table.num_rows, np.datetime64(loaded_tmstmp, 'us'))))
+        pq.write_table(table, buffer, compression='snappy',
+                       coerce_timestamps='us', allow_truncated_timestamps=True)
+
+    else:
+        # Rows are compressed as they are formatted rather than after
+        with gzip.GzipFile(fileobj=buffer, mode='wb') as compressed, \
+                io.TextIOWrapper(compressed, encoding='utf-8',
+                                 newline='') as text:
+            write_csv(df, text, loaded_tmstmp=loaded_tmstmp)
+
+    return buffer.getvalue()
+
+
+def write_part(df: pd.DataFrame, file_path: str, file_type: str = 'csv',
+               columns: list = None,
+               loaded_tmstmp: datetime.datetime = None) -> str:
+    """Writes a slice of a DataFrame to a compressed part file.
+
+    Args:
+        df: Rows of the DataFrame to write
+        file_path: Path to write the part file to
+        file_type: 'csv' or 'parquet'; see :func:`serialize_part`
+        columns: Column names to write to a Parquet file in place of the
+            DataFrame's own
+        loaded_tmstmp: Value of a *LOADED_TMSTMP* field to add to each row
+    Returns:
+        The path written to
+    """
+    with open(file_path, 'wb') as f:
+        f.write(serialize_part(df, file_type=file_type, columns=columns,
+                               loaded_tmstmp=loaded_tmstmp))
+
+    return file_path
+
+
+def write_parts(df: pd.DataFrame, parts_dir: str, chunk_rows: int = 250000,
+                max_workers: int = 4, file_type: str = 'csv',
+                columns: list = None,
+                loaded_tmstmp: datetime.datetime = None) -> list:
+    """Writes a DataFrame to compressed part files using multiple cores.
+
+    Slices of ``chunk_rows`` rows are serialized on a pool of
+    ``max_workers`` processes so that formatting and compression are not
+    bound to a single core; as the processes are started with
+    ``PROCESS_START_METHOD``, scripts must call this beneath an
+    ``if __name__ == '__main__':`` guard.
+
+    Args:
+        df: DataFrame to write
+        parts_dir: Directory to write the part files to
+        chunk_rows: Number of rows per part file
+        max_workers: Number of processes with which to write part files
+        file_type: 'csv' or 'parquet'
+        columns: Column names to write to Parquet files in place of the
+            DataFrame's own
+        loaded_tmstmp: Value of a *LOADED_TMSTMP* field to add to each row
+    Returns:
+        Paths to the part files in order
+    """
+    os.makedirs(parts_dir, exist_ok=True)
+
+    starts = range(0, max(len(df), 1), chunk_rows)
+    slices = (df.iloc[start:start + chunk_rows] for start in starts)
+    paths = [os.path.join(parts_dir, f"part_{i:05d}{PART_SUFFIXES[file_type]}")
+             for i, _ in enumerate(starts)]
+
+    with _process_pool(max(min(max_workers, len(paths)), 1)) as executor:
+        return list(executor.map(write_part, slices, paths,
+                                 itertools.repeat(file_type),
+                                 itertools.repeat(columns),
+                                 itertools.repeat(loaded_tmstmp)))
+
+
+def _process_pool(max_workers: int) -> futures.ProcessPoolExecutor:
+    """Pool of ``max_workers`` processes started with
+    ``PROCESS_START_METHOD``."""
+    return futures.ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context(PROCESS_START_METHOD))
+
+
+def serialized_parts(df: pd.DataFrame, chunk_rows: int = 0,
+                     max_workers: int = 4, file_type: str = 'csv',
+                     columns: list = None,
+                     loaded_tmstmp: datetime.datetime = None) -> \
+        Iterator[tuple]:
+    """Serializes a DataFrame to compressed parts in memory as they're needed.
+
+    Slices of ``chunk_rows`` rows are serialized on a pool of
+    ``max_workers`` processes, staying at most ``max_workers`` parts ahead
+    of the consumer so that compressing later parts overlaps with uploading
+    earlier ones while memory stays bounded.
+
+    Args:
+        df: DataFrame to serialize
+        chunk_rows: Number of rows per part; serializes a single part in
+            this process if not passed
+        max_workers: Number of processes with which to serialize parts
+        file_type: 'csv' or 'parquet'
+        columns: Column names to write to Parquet parts in place of the
+            DataFrame's own
+        loaded_tmstmp: Value of a *LOADED_TMSTMP* field to add to each row
+    Returns:
+        Generator of (file name, bytes) tuples in order
+    """
+    suffix = PART_SUFFIXES[file_type]
+    if not chunk_rows or chunk_rows >= len(df):
+        yield f"part_00000{suffix}", serialize_part(df, file_type, columns,
+                                                    loaded_tmstmp)
+        return
+
+    with _process_pool(max_workers) as executor:
+        pending = deque()
+        for i, start in enumerate(range(0, len(df), chunk_rows)):
+            pending.append((f"part_{i:05d}{suffix}",
+                            executor.submit(serialize_part,
+                                            df.iloc[start:start + chunk_rows],
+                                            file_type, columns,
+                                            loaded_tmstmp)))
+            if len(pending) > max_workers:
+                file_name, future = pending.popleft()
+                yield file_name, future.result()
+
+        while pending:
+            file_name, future = pending.popleft()
+            yield file_name, future.result()
+
+
+def stream_to_stage(df: pd.DataFrame, stage: str,
+                    connector: snowquery.Connector,
+                    chunk_rows: int = IN_MEMORY_CHUNK_ROWS,
+                    max_workers: int = 4, file_type: str = 'csv',
+                    columns: list = None,
+                    loaded_tmstmp: datetime.datetime = None) -> pd.DataFrame:
+    """Uploads a DataFrame to a stage without touching the local filesystem.
+
+    Parts are serialized and compressed in memory by
+    :func:`serialized_parts` and each is uploaded with
+    ``snowquery.Connector.put_stream`` as soon as it is ready.
+
+    Args:
+        df: DataFrame to upload
+        stage: Name of the stage to upload into
+        connector: snowquery.Connector object with which to upload
+        chunk_rows: Number of rows per part; defaults to
+            ``IN_MEMORY_CHUNK_ROWS``. DataFrames of more than one part are
+            serialized by processes started with ``PROCESS_START_METHOD``,
+            so scripts must call this beneath an
+            ``if __name__ == '__main__':`` guard
+        max_workers: Number of processes with which to serialize parts
+        file_type: 'csv' or 'parquet'
+        columns: Column names to write to Parquet parts in place of the
+            DataFrame's own
+        loaded_tmstmp: Value of a *LOADED_TMSTMP* field to add to each row
+    Returns:
+        Combined responses of each ``PUT`` or an empty DataFrame if any
+        failed
+    """
+    responses = []
+    for file_name, data in serialized_parts(df, chunk_rows=chunk_rows,
+                                            max_workers=max_workers,
+                                            file_type=file_type,
+                                            columns=columns,
+                                            loaded_tmstmp=loaded_tmstmp):
+        response = connector.put_stream(io.BytesIO(data), stage, file_name)
+        if not connector.sfqid:  # only recorded if the upload succeeded
+            return pd.DataFrame()
+        responses.append(response)
+
+    return pd.concat(responses, ignore_index=True)
+
+
+def copied_rows(response: pd.DataFrame) -> int:
+    """Number of rows loaded by a ``COPY`` given its response.
+
+    Args:
+        response: Results of the ``COPY INTO`` statement, with a
+            *rows_loaded* field for each file loaded
+    Returns:
+        Total of *rows_loaded* across files, or 0 if no files were loaded
+    """
+    for col in response.columns:
+        if str(col).lower() == 'rows_loaded':
+            return int(pd.to_numeric(response[col],
+                                     errors='coerce').fillna(0).sum())
+
+    return 0
+
+
 def remove_local(file_path: str, keep_local: bool = False) -> None:
     """Removes local copy of exported file post-loading.
 
     Args:
-        file_path: Path to write local file to
+        file_path: Path to write local file to, or a directory of part files
         keep_local: Boolean value indicating whether or not to delete local
             file post-load
     Returns:
         None
     """
-    if not keep_local:
+    if not keep_local and os.path.isdir(file_path):
+        shutil.rmtree(file_path, ignore_errors=True)
+        print(f"\n<Local part files deleted from {file_path}>")
+
+    elif not keep_local:
         os.remove(file_path)
         print(f"\n<Local copy of file deleted from {file_path}>")
 
@@ -251,11 +923,15 @@ def df_to_snowflake(df: pd.DataFrame, table_name: str,
                     force_recreate: bool = False, keep_local: bool = False,
                     output_location: str = os.getcwd(),
                     on_error: str = 'continue',
-                    file_format: str = 'csv_gem7318') -> bool:
+                    file_format: str = 'csv_gem7318',
+                    chunk_rows: int = 0, max_workers: int = 4,
+                    file_type: str = 'csv', in_memory: bool = False,
+                    stage: str = '') -> bool:
     """Loads DataFrame to a Snowflake table through a variety of operations.
 
     (1) Prepares DataFrame for load by standardizing column names
-        and adding a *LOADED_TMSTMP* field to the far right side
+        and adding a *LOADED_TMSTMP* field to the far right side; neither
+        is applied to the DataFrame itself, which is left unmodified
     (2) Checks for existence of the table in Snowflake and compares
         structure of in-warehouse table to that of local DataFrame
     (3) Defaults to creating the table if it doesn't exist, appending to the
@@ -263,7 +939,19 @@ def df_to_snowflake(df: pd.DataFrame, table_name: str,
         forgo loading the data/return a boolean value of False if
         otherwise; this can be over-ridden by passing ``force_recreate=True``
         when the function is called
-    (4) Deletes local file written out to load into a staging table
+    (4) Deletes local file written out to load into a staging table; if
+        ``chunk_rows`` is passed, the DataFrame is instead written as
+        compressed part files of ``chunk_rows`` rows each on a pool of
+        ``max_workers`` processes, uploaded with a single ``PUT`` using
+        ``max_workers`` upload threads and ingested by one ``COPY``;
+        ``file_type='parquet'`` stages typed, compressed Parquet files that
+        are loaded by column name without a user-defined file format;
+        ``in_memory=True`` serializes and compresses parts of ``chunk_rows``
+        (or ``IN_MEMORY_CHUNK_ROWS``) rows in memory and streams each to
+        the stage as it's ready, writing nothing locally;
+        passing a ``stage`` loads through that long-lived stage instead of
+        creating and dropping one per load, uploading under a prefix unique
+        to the load that is purged by the ``COPY``
     (5) Deletes the staging table after load is completed successfully
     (6) Returns a boolean value indicating whether or not the load was
         successful or not, intended for exception handling use when iterating
@@ -293,13 +981,37 @@ def df_to_snowflake(df: pd.DataFrame, table_name: str,
             current working directory
         on_error: Query parameter for how to handle loading errors
         file_format: User-defined file_format within Snowflake
+        chunk_rows: Number of rows per part file; writes a single file if
+            not passed, unless ``in_memory=True`` in which case parts of
+            ``IN_MEMORY_CHUNK_ROWS`` rows are uploaded. Parts are serialized
+            by processes started with ``PROCESS_START_METHOD``, which
+            re-import the calling script, so scripts must load in parts
+            beneath an ``if __name__ == '__main__':`` guard
+        max_workers: Number of processes with which to write part files and
+            threads with which to upload them when ``chunk_rows`` is passed
+        file_type: 'csv' to stage files in ``file_format`` or 'parquet'
+            (requires the ``arrow`` extra) to stage Parquet files
+        in_memory: Boolean value indicating whether or not to upload from
+            memory rather than through local files, in which case
+            ``keep_local`` and ``output_location`` are ignored
+        stage: Name of a managed stage to load through, created if it
+            doesn't exist and shared by loads into any table; files left on
+            it by failed loads are removed in the background after
+            ``STAGE_FILE_MAX_AGE`` seconds
     Returns:
-        Boolean value indicating whether or not load was successful
+        Boolean value indicating whether or not load was successful; the
+        number of rows the ``COPY`` reported loading is recorded in the
+        connector's ``.rows_loaded``
 
     """
+    if file_type not in LOAD_FILE_TYPES:
+        raise ValueError(f"file_type must be one of {LOAD_FILE_TYPES}, "
+                         f"not '{file_type}'")
 
-    if not connector:
+    borrowed = not connector
+    if borrowed:
         connector = snowquery.Connector()
+    connector.rows_loaded = 0
 
     continue_load = verify_load(snowflake=connector, df=df,
                                 table_name=table_name,
@@ -310,67 +1022,410 @@ def df_to_snowflake(df: pd.DataFrame, table_name: str,
         # Committing changes to make sure table creation has gone through
         connector.commit()
 
-        # File name for local copy
-        file_name = f"{table_name}.csv"
+        # LOADED_TMSTMP is added to each slice of rows as it's serialized
+        # rather than to the DataFrame itself
+        loaded_tmstmp = datetime.datetime.now()
+
+        # Parquet files are matched to the table by name so are written with
+        # the standardized column names
+        columns = snowflake_columns(df.columns)[:-1] \
+            if file_type == 'parquet' else None
+
+        if in_memory:
+            # Parts are serialized and uploaded in the PUT step itself
+            file_path = ''
+            put_source = f"<in-memory {file_type} parts>"
+            put_options = "auto_compress=false overwrite=true"
+
+        elif chunk_rows:
+            # New directory of part files, so that parts left by an earlier
+            # load aren't uploaded with them, and a pattern matching them
+            file_path = tempfile.mkdtemp(prefix=f"{table_name}_parts_",
+                                         dir=output_location)
+            write_parts(df, file_path, chunk_rows=chunk_rows,
+                        max_workers=max_workers, file_type=file_type,
+                        columns=columns, loaded_tmstmp=loaded_tmstmp)
+            put_source = os.path.join(file_path,
+                                      f"part_*{PART_SUFFIXES[file_type]}")
+            put_options = f"auto_compress=false overwrite=true " \
+                          f"parallel={max_workers}"
+
+        elif file_type == 'parquet':
+            file_path = os.path.join(output_location, f"{table_name}.parquet")
+            write_part(df, file_path, file_type=file_type, columns=columns,
+                       loaded_tmstmp=loaded_tmstmp)
+            put_source = file_path
+            put_options = "auto_compress=false overwrite=true"
 
-        # Path to write to
-        file_path = os.path.join(output_location, file_name)
+        else:
+            # File name for local copy
+            file_name = f"{table_name}.csv"
 
-        # Exporting csv to local drive
-        df.to_csv(file_path, index=False, sep='|', header=False, quotechar='"',
-                  quoting=csv.QUOTE_ALL)
+            # Path to write to
+            file_path = os.path.join(output_location, file_name)
 
-        create_stage = \
-            f"create or replace stage {table_name}_stage file_format " \
-            f"= {file_format};"
+            # Exporting csv to local drive
+            with open(file_path, 'w', encoding='utf-8', newline='') as f:
+                write_csv(df, f, loaded_tmstmp=loaded_tmstmp)
+            put_source = file_path
+            put_options = "auto_compress=true overwrite=true"
 
-        # Escaped path for put statement
-        put_path = file_path.replace('\\', '\\\\')
-        # put_path = re.escape(file_path)
+        prefix = f"{table_name}/{uuid.uuid4().hex}" if stage else ''
+        location = stage_location(table_name, stage=stage, prefix=prefix)
 
-        put_file = f"put 'file://{put_path}' @{table_name}_stage " \
-                   f"auto_compress=true overwrite=true;"
+        create_stage, copy_into, drop_stage = stage_statements(
+            table_name, file_type=file_type, file_format=file_format,
+            on_error=on_error, stage=stage, prefix=prefix)
 
-        copy_into = f"copy into {table_name}\n" \
-                    f"from @{table_name}_stage\n" \
-                    f"on_error = '{on_error}';"
+        # Escaped path for put statement
+        put_path = put_source.replace('\\', '\\\\')
+        # put_path = re.escape(file_path)
 
-        drop_stage = f"drop stage {table_name}_stage;"
+        put_file = f"put 'file://{put_path}' @{location}/ {put_options};" \
+            if stage else \
+            f"put 'file://{put_path}' @{location} {put_options};"
 
-        statements = [create_stage, put_file, copy_into, drop_stage]
+        if not stage:
+            statements = [create_stage, put_file, copy_into, drop_stage]
 
+        else:
+            # Managed stages are only created once per process and files are
+            # purged by the copy rather than the stage being dropped
+            with _managed_stages_lock:
+                known = _stage_key(stage, connector) in _managed_stages
+            statements = ([] if known else [create_stage]) + \
+                [put_file, copy_into]
+
+        completed = 0
         for i, statement in enumerate(statements, start=1):
 
             try:
-                result = connector.execute_query(statement)
+                if in_memory and statement == put_file:
+                    result = stream_to_stage(df, location,
+                                             connector,
+                                             chunk_rows=chunk_rows or
+                                             IN_MEMORY_CHUNK_ROWS,
+                                             max_workers=max_workers,
+                                             file_type=file_type,
+                                             columns=columns,
+                                             loaded_tmstmp=loaded_tmstmp)
+                else:
+                    result = connector.execute_query(statement)
+
+                # Only recorded if the statement succeeded
+                succeeded = bool(connector.sfqid)
+
+            except Exception:
+                succeeded = False
+
+            if not succeeded:
+                print(f"\n<statement {i} of {len(statements)} failed>\n"
+                      f"{statement}\n\n")
+                connector.execute_query(drop_stage)
+                break
+
+            if not stage or statement == copy_into:
                 connector.commit()
+            if statement == copy_into:
+                connector.rows_loaded = copied_rows(result)
+            if statement == create_stage and stage:
+                with _managed_stages_lock:
+                    _managed_stages.setdefault(
+                        _stage_key(stage, connector), 0)
 
-                print(
-                    f"\n<{i} of {len(statements)} completed>:\n\t"
-                    f"{statement}\nResponse:\t")
+            print(
+                f"\n<{i} of {len(statements)} completed>:\n\t"
+                f"{statement}\nResponse:\t")
 
-                list_responses = \
-                    [f"{' '.join(col.title().split('_'))}: {result.iat[0, i1]}"
-                        for i1, col in enumerate(list(result.columns))]
+            list_responses = \
+                [f"{' '.join(col.title().split('_'))}: {result.iat[0, i1]}"
+                    for i1, col in enumerate(list(result.columns))] \
+                if not result.empty else []
 
-                for response in list_responses:
-                    print(f"\t{response}")
+            for response in list_responses:
+                print(f"\t{response}")
 
-            except:
-                print(f"\n<statement {i} of 4 failed>\n{statement}\n\n")
-                connector.execute_query(statements[-1])
-                break
+            completed = i
 
-        remove_local(file_path, keep_local)  # Defaults to delete local file
+        if stage:
+            _collect_in_background(stage, connector)
 
-    else:
-        i = 1
-    if list(df.columns)[-1:] == ['LOADED_TMSTMP']:
-        df.drop(columns=list(df.columns)[-1:], axis=1, inplace=True)
-    if continue_load and i == 4:
-        continue_load = True
+        if file_path:
+            remove_local(file_path, keep_local)  # Defaults to delete local file
+
+        continue_load = completed == len(statements)
+
+    if borrowed:
+        connector.disconnect()
+
+    return continue_load
+
+
+def iter_batches(source, batch_rows: int = 500000) -> Iterator[pd.DataFrame]:
+    """Yields DataFrames from a source one batch at a time.
+
+    Args:
+        source: A DataFrame, an iterable of DataFrames, or the path to (or
+            glob pattern matching) local CSV or Parquet files, which are read
+            ``batch_rows`` rows at a time
+        batch_rows: Number of rows per batch read from files
+    Returns:
+        Generator of DataFrames
+    """
+    if isinstance(source, pd.DataFrame):
+        yield source
+        return
+
+    if not isinstance(source, str):
+        yield from source
+        return
+
+    for path in sorted(glob.glob(source)) or [source]:
+
+        if path.lower().endswith(('.parquet', '.pq')):
+            import pyarrow.parquet as pq
+
+            for batch in pq.ParquetFile(path).iter_batches(
+                    batch_size=batch_rows):
+                yield batch.to_pandas()
+
+        else:
+            yield from pd.read_csv(path, chunksize=batch_rows)
+
+
+def stream_to_snowflake(batches, table_name: str,
+                        connector: snowquery.Connector = '',
+                        force_recreate: bool = False,
+                        on_error: str = 'continue',
+                        file_format: str = 'csv_gem7318',
+                        file_type: str = 'csv',
+                        batch_rows: int = 500000, stage: str = '') -> bool:
+    """Loads batches of data larger than memory to a Snowflake table.
+
+    (1) Validates the first batch against the table in the same way as
+        ``df_to_snowflake``, creating or recreating the table if needed
+    (2) Serializes and compresses each batch in memory as it arrives and
+        uploads it to the table's stage, so that at most one batch is held
+        in memory at once; batches whose columns differ from the first
+        batch's stop the load
+    (3) Loads every staged batch with a single ``COPY`` and drops the stage
+
+    .. code-block:: python
+
+        def generate_batches():
+            for month in range(1, 13):
+                yield build_month(month)
+
+        snowloader.stream_to_snowflake(generate_batches(), 'SALES')
+        snowloader.stream_to_snowflake('/data/sales_*.parquet', 'SALES')
+
+    Args:
+        batches: Iterable of DataFrames, or the path to (or glob pattern
+            matching) local CSV or Parquet files to read in batches
+        table_name: Table name to load the data into
+        connector: Pre-instantiated snowquery.Connector() instance with
+            which to execute the load to Snowflake
+        force_recreate: Boolean value indicating whether or not to recreate
+            the table irrelevant of matching structure between local and DB
+        on_error: Query parameter for how to handle loading errors
+        file_format: User-defined file_format within Snowflake
+        file_type: 'csv' to stage batches in ``file_format`` or 'parquet'
+            (requires the ``arrow`` extra) to stage Parquet files
+        batch_rows: Number of rows per batch read from files
+        stage: Name of a managed stage to load through; see
+            ``df_to_snowflake``
+    Returns:
+        Boolean value indicating whether or not load was successful; the
+        number of rows the ``COPY`` reported loading is recorded in the
+        connector's ``.rows_loaded``
+
+    """
+    if file_type not in LOAD_FILE_TYPES:
+        raise ValueError(f"file_type must be one of {LOAD_FILE_TYPES}, "
+                         f"not '{file_type}'")
+
+    batches = iter_batches(batches, batch_rows=batch_rows)
+    first = next(batches, None)
+    if first is None:
+        print(f"<no batches to load into {table_name}>")
+        return False
+
+    borrowed = not connector
+    if borrowed:
+        connector = snowquery.Connector()
+    connector.rows_loaded = 0
+
+    continue_load = verify_load(snowflake=connector, df=first,
+                                table_name=table_name,
+                                force_recreate=force_recreate)
+
+    prefix = f"{table_name}/{uuid.uuid4().hex}" if stage else ''
+    location = stage_location(table_name, stage=stage, prefix=prefix)
+
+    create_stage, copy_into, drop_stage = stage_statements(
+        table_name, file_type=file_type, file_format=file_format,
+        on_error=on_error, stage=stage, prefix=prefix)
+
+    if continue_load and stage:
+        with _managed_stages_lock:
+            known = _stage_key(stage, connector) in _managed_stages
+        if not known:
+            connector.execute_query(create_stage, results=False)
+        continue_load = staged_to = known or bool(connector.sfqid)
+        if staged_to:
+            with _managed_stages_lock:
+                _managed_stages.setdefault(_stage_key(stage, connector), 0)
+
+    elif continue_load:
+        connector.commit()
+        connector.execute_query(create_stage, results=False)
+        continue_load = staged_to = bool(connector.sfqid)
 
     else:
-        continue_load = False
+        staged_to = False
+
+    suffix = PART_SUFFIXES[file_type]
+    loaded_tmstmp = datetime.datetime.now()
+    columns = list(first.columns)
+    names = snowflake_columns(columns)[:-1] \
+        if file_type == 'parquet' else None
+
+    batch, staged, rows = first, 0, 0
+    while continue_load and batch is not None:
+
+        if list(batch.columns) != columns:
+            print(f"\n<batch {staged + 1} columns don't match those of the "
+                  f"first batch>\n\t{list(batch.columns)}\n")
+            continue_load = False
+            break
+
+        data = serialize_part(batch, file_type=file_type, columns=names,
+                              loaded_tmstmp=loaded_tmstmp)
+        connector.put_stream(io.BytesIO(data), location,
+                             f"batch_{staged:05d}{suffix}")
+        if not connector.sfqid:  # only recorded if the upload succeeded
+            continue_load = False
+            break
+
+        staged += 1
+        rows += len(batch)
+        print(f"\r<{staged} batch(es), {rows} row(s) staged>", end='')
+
+        batch = next(batches, None)
+
+    if continue_load:
+        print(f"\n<loading {staged} batch(es) into {table_name}>")
+        result = connector.execute_query(copy_into)
+        continue_load = bool(connector.sfqid)
+        if continue_load:
+            connector.rows_loaded = copied_rows(result)
+        for i1, col in enumerate(list(result.columns)):
+            print(f"\t{' '.join(col.title().split('_'))}: "
+                  f"{result.iat[0, i1]}")
+
+    # Files on a managed stage are purged by a successful copy
+    if staged_to and not (stage and continue_load):
+        connector.execute_query(drop_stage, results=False)
+        connector.commit()
+
+    if stage and staged_to:
+        _collect_in_background(stage, connector)
+
+    if borrowed:
+        connector.disconnect()
 
     return continue_load
+
+
+def load_tables(dfs: dict, connector: snowquery.Connector = '',
+                max_workers: int = 8, **kwargs) -> pd.DataFrame:
+    """Loads many DataFrames into their own tables concurrently.
+
+    (1) Looks up the columns of every target table with a single metadata
+        query through :func:`prefetch_tables`, so validating each load
+        doesn't query INFORMATION_SCHEMA again
+    (2) Runs ``df_to_snowflake`` for up to ``max_workers`` tables at once,
+        each on its own session borrowed from ``snowconn.pool`` under the
+        connector's credentials, so that serializing, uploading and copying
+        different tables overlap
+    (3) Returns a report of each table's outcome rather than a single
+        boolean value; a failing table does not affect the others
+
+    .. code-block:: python
+
+        report = snowloader.load_tables(dfs_to_load, in_memory=True)
+        print(report[~report['loaded']])
+
+    Args:
+        dfs: Dictionary of {table name: DataFrame} to load
+        connector: Pre-instantiated snowquery.Connector() instance whose
+            credentials the loads are executed with
+        max_workers: Maximum number of tables to load at once
+        **kwargs: Arguments to pass to ``df_to_snowflake`` for every table,
+            such as ``force_recreate``, ``file_type``, ``in_memory`` or
+            ``stage``
+    Returns:
+        DataFrame indexed by table name with whether or not each table
+        loaded, the number of rows its ``COPY`` reported loading, the
+        seconds taken and the error raised if any
+
+    """
+    started = time.perf_counter()
+
+    borrowed = not connector
+    if borrowed:
+        connector = snowquery.Connector(mode='lazy')
+
+    print(f"<validating {len(dfs)} table(s)>")
+    prefetch_tables(list(dfs), connector)
+
+    # Workers borrow their own sessions, so the one used to validate is
+    # returned to the pool for them if it isn't the caller's
+    if borrowed:
+        connector.disconnect()
+
+    with futures.ThreadPoolExecutor(
+            max_workers=max(min(max_workers, len(dfs)), 1)) as executor:
+        submitted = {
+            table_name: executor.submit(_load_isolated, df, table_name,
+                                        connector.config_file,
+                                        connector.conn_name,
+                                        connector.ledger, kwargs)
+            for table_name, df in dfs.items()
+        }
+        report = [(table_name,) + future.result()
+                  for table_name, future in submitted.items()]
+
+    report = pd.DataFrame(report, columns=['table_name', 'loaded', 'rows',
+                                           'seconds', 'error'])
+    report = report.set_index('table_name')
+
+    print(f"\n<{int(report['loaded'].sum())} of {len(report)} table(s) "
+          f"loaded in {time.perf_counter() - started:.1f}s>")
+
+    return report
+
+
+def _load_isolated(df: pd.DataFrame, table_name: str, config_file: str,
+                   conn_name: str, ledger, kwargs: dict) -> tuple:
+    """Loads a DataFrame on its own pooled session, capturing any error.
+
+    Returns:
+        Tuple of (loaded, rows, seconds, error) with None as the error if
+        none was raised
+    """
+    started = time.perf_counter()
+
+    try:
+        with snowquery.Connector(config_file, conn_name, mode='lazy',
+                                 ledger=ledger) as connector:
+            loaded = df_to_snowflake(df, table_name, connector=connector,
+                                     **kwargs)
+        error = None
+
+    except Exception as e:
+        loaded, error = False, e
+
+    rows = connector.rows_loaded if loaded else 0
+
+    return loaded, rows, time.perf_counter() - started, error
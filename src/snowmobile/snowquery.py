@@ -1,26 +1,161 @@
 
+import os
+import time
+import asyncio
+import threading
+from typing import Iterator
+from collections import deque
+from concurrent import futures
+from concurrent.futures import Future
+import numpy as np
 import snowflake.connector as sf
+from snowflake.connector.constants import FIELD_ID_TO_NAME
 import pandas as pd
+from pandas.api.types import union_categoricals
 from snowmobile import snowconn
+from snowmobile import snowcreds
+from snowmobile import snowcache
+from snowmobile import snowledger
+
+CONNECT_MODES = ('eager', 'lazy', 'background')
+
+# Error numbers raised once a session can no longer be renewed by the
+# connector itself (session gone, master token expired/missing/invalid)
+SESSION_EXPIRED_ERRNOS = {390111, 390112, 390113, 390114, 390115}
+
+# Rows fetched to estimate row width when streaming by byte size
+PROBE_ROWS = 1000
+
+ARROW_RETURN_TYPES = ('pandas', 'arrow', 'batches')
+
+# Number of (query id, query) pairs kept in Connector.query_ids
+QUERY_ID_HISTORY = 1000
+
+# Rows fetched per chunk when compacting results and the ratio of unique to
+# total values at or below which a text column is made categorical
+COMPACT_CHUNK_ROWS = 100000
+CATEGORY_RATIO = 0.5
 
 
 class Connector(snowconn.Connection):
-    """Primary Connection and Query Execution Class"""
+    """Primary Connection and Query Execution Class
+
+    Can be used as a context manager, in which case its session is returned
+    to the pool on exit:
+
+    .. code-block:: python
+
+        with snowquery.Connector(conn_name='SANDBOX') as sf:
+            sample = sf.execute_query('select * from sample_table')
+
+    Args:
+        config_file: Name of .json configuration file following the
+            format of connection_credentials_SAMPLE.json.
+        conn_name: Name of connection within json file to use - it will
+            use first set of credentials in the file if no argument is
+            passed.
+        mode: When to establish the session; 'eager' connects on
+            instantiation, 'lazy' connects on first use and 'background'
+            starts connecting on a separate thread on instantiation so that
+            authentication overlaps with the caller's own work.
+        result_cache: snowcache.ResultCache in which to cache the results of
+            read-only statements run through :meth:`execute_query`.
+        ledger: snowledger.Ledger in which to record the timing and size of
+            each execution; pass None to disable recording.
+
+    """
 
     def __init__(self, config_file: str = 'snowflake_credentials.json',
-                 conn_name: str = '') -> None:
+                 conn_name: str = '', mode: str = 'eager',
+                 result_cache: snowcache.ResultCache = None,
+                 ledger: snowledger.Ledger = snowledger.ledger) -> None:
+        if mode not in CONNECT_MODES:
+            raise ValueError(f"mode must be one of {CONNECT_MODES}, "
+                             f"not '{mode}'")
+
         super().__init__(config_file, conn_name)
 
-        self.conn = snowconn.Connection(config_file=self.config_file,
-                                        conn_name=self.conn_name).get_conn()
+        self.mode = mode
+        self.result_cache = result_cache
+        self.ledger = ledger
+        self.sfqid = ''
+        self.query_ids = deque(maxlen=QUERY_ID_HISTORY)
+        self._conn_lock = threading.Lock()
+        self._pending = None
 
-    def execute_query(self, query: str, results: bool = True) -> \
-            pd.DataFrame:
+        if mode == 'eager':
+            self.conn = self.get_conn()
+
+        elif mode == 'background':
+            self._pending = Future()
+            threading.Thread(target=self._connect_in_background,
+                             daemon=True).start()
+
+    @property
+    def conn(self) -> sf.SnowflakeConnection:
+        """Session for the Connector, established on first access if needed.
+
+        Waits on authentication started by ``mode='background'`` and
+        re-borrows a session from the pool after :meth:`disconnect`.
+        """
+        if self._conn is None:
+            with self._conn_lock:
+                if self._pending is not None:
+                    pending, self._pending = self._pending, None
+                    self._conn = pending.result()
+
+                elif self._conn is None:
+                    self.get_conn()
+
+        return self._conn
+
+    @conn.setter
+    def conn(self, conn: sf.SnowflakeConnection) -> None:
+        self._conn = conn
+
+    def __enter__(self) -> object:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.disconnect()
+        return None
+
+    def __del__(self) -> None:
+        try:
+            self.release()
+        except Exception:
+            pass
+
+    def _connect_in_background(self) -> None:
+        try:
+            self._pending.set_result(self.get_conn())
+        except Exception as e:
+            self._pending.set_exception(e)
+
+        return None
+
+    def execute_query(self, query: str, results: bool = True,
+                      use_cache: bool = True, params=None,
+                      compact: bool = False) -> pd.DataFrame:
         """Execute commands & query data from the warehouse.
 
+        Values can be bound server-side in place of ``?`` placeholders in the
+        SQL, which keeps the statement text identical across calls:
+
+        .. code-block:: python
+
+            sf.execute_query('select * from sample_table where id = ?',
+                             params=[42])
+
         Args:
             query: Raw SQL to execute.
             results: Boolean value indicating whether or not to return results
+            use_cache: Boolean value indicating whether or not to look up and
+                store the results of a read-only query in ``result_cache``
+            params: Sequence of values to bind to the query's placeholders
+            compact: Boolean value indicating whether or not to convert
+                results to the tightest dtypes allowed by their metadata as
+                they are fetched; see :func:`compact_frame`
         Returns:
             Results from query in a Pandas DataFrame by default or None if
             ``results=False`` is passed when function is called.
@@ -30,17 +165,29 @@ class Connector(snowconn.Connection):
 
         if self.query:
 
-            try:
-                self.results = pd.read_sql(query, self.conn)
+            self.sfqid = ''
+            key = self.cache_key(query, params, compact) if use_cache \
+                else None
+            cached, cached_sfqid = self.result_cache.lookup(key) if key \
+                else (None, '')
+
+            if cached is not None:
+                # Keeps the id of the execution that produced the results
+                # so that they can still be scanned by it
+                self.sfqid = cached_sfqid
+                self.results = cached
 
-            except sf.errors.ProgrammingError as e:
+            else:
+                try:
+                    self.results = self._query_frame(query, params, compact)
+                    if key:
+                        self.result_cache.put(key, self.results, self.sfqid)
 
-                print(e)  # default error message
+                except sf.errors.ProgrammingError as e:
 
-                print(f'Error {e.errno} ({e.sqlstate}): {e.msg} ('
-                      f'{e.sfqid})')  # custom error message
+                    self._print_error(e)
 
-                self.results = pd.DataFrame()
+                    self.results = pd.DataFrame()
 
         if self.return_results:
             return self.results
@@ -48,16 +195,677 @@ class Connector(snowconn.Connection):
         else:
             return None
 
+    def _query_frame(self, query: str, params=None,
+                     compact: bool = False) -> pd.DataFrame:
+        """Executes a query and fetches its results, recording both."""
+        started = time.perf_counter()
+        cursor = self._execute(query, params)
+        executed = time.perf_counter()
+
+        df = self._fetch_compact(cursor) if compact else \
+            self._to_frame(cursor)
+        self._log(query, cursor.sfqid, started, executed, rows=len(df),
+                  result_bytes=df.memory_usage(deep=True).sum())
+
+        return df
+
+    def result_scan(self, sfqid: str = '', columns: str = '*',
+                    where: str = '', order_by: str = '', limit: int = None,
+                    offset: int = 0, results: bool = True) -> pd.DataFrame:
+        """Re-fetch the results of a previous query without re-running it.
+
+        Selects from ``TABLE(RESULT_SCAN('<sfqid>'))`` so that a result can
+        be fetched again, paged through or filtered within the 24 hours
+        Snowflake retains it, without recomputing it in the warehouse.
+
+        .. code-block:: python
+
+            sf.execute_query('select * from sample_table')
+            first_qid = sf.sfqid
+            page_2 = sf.result_scan(first_qid, limit=1000, offset=1000)
+            errors = sf.result_scan(first_qid, where="status = 'ERROR'")
+
+        Args:
+            sfqid: Query id of the result to fetch; defaults to that of the
+                last statement executed, available in ``.sfqid``
+            columns: Columns or expressions to select
+            where: Condition to filter rows on
+            order_by: Expression to order rows by
+            limit: Maximum number of rows to return
+            offset: Number of rows to skip
+            results: Boolean value indicating whether or not to return results
+        Returns:
+            Results from the scan in a Pandas DataFrame by default or None if
+            ``results=False`` is passed when function is called.
+        """
+        sql = f"select {columns}\n" \
+              f"from table(result_scan('{sfqid or self.sfqid}'))"
+        if where:
+            sql += f"\nwhere {where}"
+        if order_by:
+            sql += f"\norder by {order_by}"
+        if limit is not None:
+            sql += f"\nlimit {limit}"
+        if offset:
+            sql += f"\noffset {offset}" if limit is not None else \
+                f"\nlimit null offset {offset}"
+
+        return self.execute_query(sql, results=results, use_cache=False)
+
+    def cache_key(self, query: str, params=None,
+                  compact: bool = False) -> str:
+        """Key of a query's results within ``result_cache``.
+
+        Keys combine the normalized SQL and any bound parameters with the
+        session's current role, warehouse, database and schema.
+
+        Returns:
+            Key for the query or None if there is no ``result_cache`` or the
+            query is not read-only.
+        """
+        if self.result_cache is None or \
+                not self.result_cache.cacheable(query):
+            return None
+
+        context = self._session_context()
+        if params:
+            context += (repr(params),)
+        if compact:
+            context += ('compact',)
+
+        return self.result_cache.key(query, context)
+
+    def _session_context(self) -> tuple:
+        """Current (role, warehouse, database, schema) of the session."""
+        return tuple(getattr(self.conn, attr, None) for attr in
+                     ('role', 'warehouse', 'database', 'schema'))
+
+    def invalidate_cached(self, query: str, params=None) -> None:
+        """Removes the cached results of a query from ``result_cache``."""
+        key = self.cache_key(query, params)
+        if key:
+            self.result_cache.invalidate(key)
+
+        return None
+
+    def stream_query(self, query: str, chunk_rows: int = 100000,
+                     chunk_bytes: int = None, params=None,
+                     compact: bool = False) -> Iterator[pd.DataFrame]:
+        """Execute a query and yield its results in DataFrame chunks.
+
+        Rows are fetched from the cursor as result batches arrive so that
+        only one chunk is held in memory at a time, regardless of the size
+        of the full result set.
+
+        .. code-block:: python
+
+            for chunk in sf.stream_query(sql, chunk_bytes=256 * 2 ** 20):
+                process(chunk)
+
+        Args:
+            query: Raw SQL to execute.
+            chunk_rows: Number of rows per chunk.
+            chunk_bytes: Approximate in-memory size of each chunk in bytes;
+                takes precedence over ``chunk_rows`` if passed, using the
+                first PROBE_ROWS rows and each chunk thereafter to estimate
+                the width of a row
+            params: Sequence of values to bind to the query's placeholders
+            compact: Boolean value indicating whether or not to convert each
+                chunk to the tightest dtypes allowed by the result metadata;
+                see :func:`compact_frame`
+        Returns:
+            Generator of DataFrames, which yields nothing if the query
+            fails.
+        """
+        started = time.perf_counter()
+        try:
+            cursor = self._execute(query, params)
+
+        except sf.errors.ProgrammingError as e:
+            self._print_error(e)
+            return
+
+        executed = time.perf_counter()
+        rows, result_bytes = 0, 0
+
+        try:
+            for chunk in self._iter_chunks(cursor, chunk_rows, chunk_bytes):
+                if compact:
+                    chunk = compact_frame(chunk, cursor.description)
+                rows += len(chunk)
+                result_bytes += chunk.memory_usage(deep=True).sum()
+                yield chunk
+
+        finally:
+            cursor.close()
+            self._log(query, cursor.sfqid, started, executed, rows=rows,
+                      result_bytes=result_bytes)
+
+    @staticmethod
+    def _iter_chunks(cursor: sf.cursor.SnowflakeCursor, chunk_rows: int,
+                     chunk_bytes: int = None) -> Iterator[pd.DataFrame]:
+        """Fetches an executed cursor's results in DataFrame chunks."""
+        columns = [col[0] for col in cursor.description]
+        rows = min(chunk_rows, PROBE_ROWS) if chunk_bytes else chunk_rows
+
+        while True:
+            batch = cursor.fetchmany(rows)
+            if not batch:
+                break
+
+            chunk = pd.DataFrame.from_records(batch, coerce_float=True,
+                                              columns=columns)
+            del batch
+
+            if chunk_bytes:
+                row_bytes = chunk.memory_usage(deep=True).sum() / len(chunk)
+                rows = max(int(chunk_bytes // row_bytes), 1)
+
+            yield chunk
+
+    def _fetch_compact(self, cursor: sf.cursor.SnowflakeCursor) -> \
+            pd.DataFrame:
+        """Fetches and compacts results a chunk at a time.
+
+        Reports and records the memory saved in ``.memory_saved`` (bytes).
+        """
+        before, frames = 0, []
+        for chunk in self._iter_chunks(cursor, COMPACT_CHUNK_ROWS):
+            before += chunk.memory_usage(deep=True).sum()
+            frames.append(compact_frame(chunk, cursor.description))
+            del chunk
+
+        df = _concat_compact(frames) if frames else \
+            pd.DataFrame(columns=[col[0] for col in cursor.description])
+        after = df.memory_usage(deep=True).sum()
+
+        self.memory_saved = int(before - after)
+        print(f"<compacted results from {before / 2 ** 20:,.1f}MB to "
+              f"{after / 2 ** 20:,.1f}MB, saving "
+              f"{self.memory_saved / 2 ** 20:,.1f}MB>")
+
+        return df
+
+    def execute_arrow(self, query: str, returns: str = 'pandas',
+                      params=None) -> object:
+        """Execute a query and fetch its results as Arrow data.
+
+        Skips the row-by-row conversion of :meth:`execute_query` by fetching
+        the connector's Arrow result batches directly, which is much faster
+        for wide or large results. Requires the ``arrow`` extra
+        (``pip install snowmobile[arrow]``) and a query that returns rows.
+
+        Args:
+            query: Raw SQL to execute.
+            returns: Type of object to return; 'pandas' for a DataFrame
+                converted from Arrow without intermediate copies where
+                possible, 'arrow' for a ``pyarrow.Table`` or 'batches' for
+                an iterator of ``pyarrow.Table`` batches as they arrive.
+            params: Sequence of values to bind to the query's placeholders
+        Returns:
+            Results in the type given by ``returns``, empty if the query
+            fails.
+        """
+        import pyarrow as pa
+
+        if returns not in ARROW_RETURN_TYPES:
+            raise ValueError(f"returns must be one of {ARROW_RETURN_TYPES},"
+                             f" not '{returns}'")
+
+        started = time.perf_counter()
+        try:
+            cursor = self._execute(query, params)
+
+        except sf.errors.ProgrammingError as e:
+            self._print_error(e)
+            table = pa.table({})
+            return iter([]) if returns == 'batches' else \
+                table if returns == 'arrow' else pd.DataFrame()
+
+        executed = time.perf_counter()
+
+        if returns == 'batches':
+            self._log(query, cursor.sfqid, started, executed)
+            return cursor.fetch_arrow_batches()
+
+        table = cursor.fetch_arrow_all()
+        if table is None:  # no rows returned
+            table = pa.table({col[0]: pa.array([], pa.null())
+                              for col in cursor.description})
+        self._log(query, cursor.sfqid, started, executed,
+                  rows=table.num_rows, result_bytes=table.nbytes)
+
+        if returns == 'arrow':
+            return table
+
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def spill_query(self, query: str, directory: str = '', params=None,
+                    refresh: bool = False) -> snowcache.SpilledResult:
+        """Execute a query and write its results straight to disk.
+
+        Arrow result batches are written to an uncompressed Feather file as
+        they arrive, so results larger than memory can be extracted, and a
+        memory-mapped handle on the file is returned in place of a
+        DataFrame. Files are named by the query and session context, so
+        running the same query again re-uses the file without touching the
+        warehouse. Requires the ``arrow`` extra.
+
+        Args:
+            query: Raw SQL to execute.
+            directory: Directory to write to; defaults to the current
+                working directory.
+            params: Sequence of values to bind to the query's placeholders
+            refresh: Boolean value indicating whether or not to re-run the
+                query even if its results have already been spilled
+        Returns:
+            snowcache.SpilledResult for the file, or None if the query fails.
+        """
+        import pyarrow as pa
+
+        context = self._session_context() + ((repr(params),) if params
+                                             else ())
+        path = os.path.join(directory or os.getcwd(),
+                            f"{snowcache.ResultCache.key(query, context)}"
+                            f".feather")
+
+        if os.path.isfile(path) and not refresh:
+            print(f"<re-using spilled results in {path}>")
+            return snowcache.SpilledResult(path)
+
+        started = time.perf_counter()
+        try:
+            cursor = self._execute(query, params)
+
+        except sf.errors.ProgrammingError as e:
+            self._print_error(e)
+            return None
+
+        executed = time.perf_counter()
+        schema = arrow_schema(cursor.description)
+        partial = f"{path}.part"
+        rows = 0
+
+        with pa.OSFile(partial, 'wb') as sink, \
+                pa.ipc.new_file(sink, schema) as writer:
+            for batch in cursor.fetch_arrow_batches():
+                writer.write_table(batch.cast(schema))
+                rows += batch.num_rows
+
+        os.replace(partial, path)
+        self._log(query, cursor.sfqid, started, executed, rows=rows,
+                  result_bytes=os.path.getsize(path))
+        print(f"<spilled results to {path}>")
+
+        return snowcache.SpilledResult(path)
+
+    async def aexecute_query(self, query: str, results: bool = True,
+                             timeout: float = None,
+                             poll_interval: float = 0.25) -> pd.DataFrame:
+        """Execute a query without blocking the event loop.
+
+        The query is submitted asynchronously and its status polled every
+        ``poll_interval`` seconds so that many queries can be in flight on
+        the same session; blocking connector calls run in the loop's default
+        executor. Cancelling the awaiting task or exceeding ``timeout``
+        cancels the query in the warehouse. Any object with the interface of
+        a snowflake connection can be assigned to ``.conn`` in place of a
+        live session.
+
+        .. code-block:: python
+
+            sf = snowquery.Connector()
+            results = await asyncio.gather(
+                *(sf.aexecute_query(sql) for sql in queries))
+
+        Args:
+            query: Raw SQL to execute.
+            results: Boolean value indicating whether or not to return results
+            timeout: Number of seconds after which to cancel the query and
+                raise ``asyncio.TimeoutError``; waits indefinitely if not
+                passed
+            poll_interval: Number of seconds between status checks
+        Returns:
+            Results from query in a Pandas DataFrame by default or None if
+            ``results=False`` is passed when function is called.
+        """
+        loop = asyncio.get_running_loop()
+        conn = await loop.run_in_executor(None, lambda: self.conn)
+        cursor = conn.cursor()
+
+        try:
+            started = time.perf_counter()
+            await loop.run_in_executor(None, cursor.execute_async, query)
+            self._record(cursor.sfqid, query)
+            returned, executed = await asyncio.wait_for(
+                self._await_results(cursor, poll_interval), timeout)
+            self._log(query, cursor.sfqid, started, executed,
+                      rows=len(returned),
+                      result_bytes=returned.memory_usage(deep=True).sum())
+
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            if cursor.sfqid:
+                await loop.run_in_executor(None, self._cancel, cursor.sfqid)
+            raise
+
+        except sf.errors.ProgrammingError as e:
+            self._print_error(e)
+            returned = pd.DataFrame()
+
+        return returned if results else None
+
+    async def _await_results(self, cursor: sf.cursor.SnowflakeCursor,
+                             poll_interval: float) -> tuple:
+        """Polls an asynchronously submitted query until it has finished.
+
+        Returns:
+            Tuple of the results and the ``time.perf_counter()`` value at
+            which the query finished executing.
+        """
+        loop = asyncio.get_running_loop()
+        conn = cursor.connection
+
+        while True:
+            status = await loop.run_in_executor(
+                None, conn.get_query_status_throw_if_error, cursor.sfqid)
+            if not conn.is_still_running(status):
+                break
+            await asyncio.sleep(poll_interval)
+
+        executed = time.perf_counter()
+        await loop.run_in_executor(None, cursor.get_results_from_sfqid,
+                                   cursor.sfqid)
+
+        df = await loop.run_in_executor(None, self._to_frame, cursor)
+
+        return df, executed
+
+    def _cancel(self, sfqid: str) -> None:
+        """Cancels a running query by its query id."""
+        try:
+            self.conn.cursor().execute(
+                f"select system$cancel_query('{sfqid}')")
+            print(f"<cancelled query {sfqid}>")
+        except sf.errors.Error as e:
+            self._print_error(e)
+
+        return None
+
+    @staticmethod
+    def _to_frame(cursor: sf.cursor.SnowflakeCursor) -> pd.DataFrame:
+        """Builds a DataFrame from the results of an executed cursor."""
+        return pd.DataFrame.from_records(
+            cursor.fetchall(), coerce_float=True,
+            columns=[col[0] for col in cursor.description])
+
+    @staticmethod
+    def _print_error(e: Exception) -> None:
+        print(e)  # default error message
+
+        if isinstance(e, sf.errors.Error):
+            print(f'Error {e.errno} ({e.sqlstate}): {e.msg} ('
+                  f'{e.sfqid})')  # custom error message
+
+        return None
+
+    def put_stream(self, stream, stage: str, file_name: str,
+                   overwrite: bool = True) -> pd.DataFrame:
+        """Uploads the contents of a file-like object to a stage.
+
+        Nothing is read from or written to the local filesystem; the stream
+        is uploaded as it is, so should already be compressed if intended to
+        be.
+
+        .. code-block:: python
+
+            buffer = io.BytesIO(gzip.compress(csv_text.encode()))
+            sf.put_stream(buffer, 'sample_stage', 'sample.csv.gz')
+
+        Args:
+            stream: Binary file-like object, such as an io.BytesIO, to upload
+            stage: Name of the stage, optionally followed by a path, to
+                upload into
+            file_name: Name of the file to create on the stage
+            overwrite: Boolean value indicating whether or not to replace a
+                file of the same name on the stage
+        Returns:
+            Response of the ``PUT`` in a DataFrame or an empty DataFrame if it
+            failed.
+        """
+        put = f"put 'file://{file_name}' @{stage} auto_compress=false " \
+              f"overwrite={str(overwrite).lower()};"
+
+        self.query = put
+        self.sfqid = ''
+        started = time.perf_counter()
+
+        try:
+            cursor = self._execute(put, file_stream=stream)
+            executed = time.perf_counter()
+            df = self._to_frame(cursor)
+
+        except sf.errors.ProgrammingError as e:
+            self._print_error(e)
+            return pd.DataFrame()
+
+        self._log(put, cursor.sfqid, started, executed, rows=len(df),
+                  result_bytes=df.memory_usage(deep=True).sum())
+
+        return df
+
+    def executemany(self, query: str, rows, batch_size: int = None) -> int:
+        """Execute a statement once per row of values in bulk.
+
+        Rows are bound server-side as arrays so that each batch is sent in a
+        single round trip, which makes this suitable for inserting many
+        small rows:
+
+        .. code-block:: python
+
+            sf.executemany('insert into sample_table values (?, ?)',
+                           [(1, 'a'), (2, 'b'), (3, 'c')])
+
+        Args:
+            query: Raw SQL with ``?`` placeholders.
+            rows: Sequence of sequences of values to bind, one per execution.
+            batch_size: Number of rows to send per round trip; sends all
+                rows at once if not passed
+        Returns:
+            Number of rows affected, or -1 if the statement fails.
+        """
+        rows = list(rows)
+        batch_size = batch_size or max(len(rows), 1)
+        affected = 0
+
+        try:
+            for start in range(0, len(rows), batch_size):
+                started = time.perf_counter()
+                cursor = self.conn.cursor()
+                cursor.executemany(query, rows[start:start + batch_size])
+                self._record(cursor.sfqid, query)
+                affected += cursor.rowcount or 0
+                self._log(query, cursor.sfqid, started, time.perf_counter(),
+                          rows=cursor.rowcount)
+
+        except sf.errors.ProgrammingError as e:
+            self._print_error(e)
+            return -1
+
+        return affected
+
+    def execute_batch(self, queries, max_workers: int = 8,
+                      ordered: bool = True) -> object:
+        """Execute independent queries concurrently on pooled sessions.
+
+        Each query runs on its own session borrowed from ``snowconn.pool``
+        under the Connector's credentials, with at most ``max_workers`` in
+        flight at once. A failing query does not affect the others; its
+        error is captured rather than printed.
+
+        .. code-block:: python
+
+            regions = {r: f"select * from sales where region = '{r}'"
+                       for r in ('NA', 'EMEA', 'APAC')}
+            by_region = sf.execute_batch(regions)
+
+            for region, df, error in sf.execute_batch(regions, ordered=False):
+                ...
+
+        Args:
+            queries: List of queries or dictionary of {key: query}.
+            max_workers: Maximum number of queries to run at once.
+            ordered: Boolean value indicating whether to wait for all
+                queries and return their results in order, or to return a
+                generator of results as each query completes.
+        Returns:
+            If ``ordered``, results in a list or dictionary matching
+            ``queries`` with an empty DataFrame for each query that failed
+            and the errors in ``.batch_errors`` by the same keys. Otherwise
+            a generator of (key, DataFrame, error) tuples where key is the
+            query's dictionary key or list index and error is None on
+            success.
+        """
+        keyed = dict(queries) if isinstance(queries, dict) else \
+            dict(enumerate(queries))
+
+        executor = futures.ThreadPoolExecutor(
+            max_workers=max(min(max_workers, len(keyed)), 1))
+        submitted = {
+            executor.submit(_run_isolated, self.config_file, self.conn_name,
+                            sql, self.ledger): key
+            for key, sql in keyed.items()
+        }
+
+        if not ordered:
+            return _as_completed(executor, submitted)
+
+        with executor:
+            returned = {submitted[f]: f.result() for f in submitted}
+
+        self.batch_errors = {key: error for key, (_, error) in
+                             returned.items() if error is not None}
+        frames = [returned[key][0] for key in keyed]
+
+        return dict(zip(keyed, frames)) if isinstance(queries, dict) \
+            else frames
+
+    def _execute(self, query: str, params=None, file_stream=None) -> \
+            sf.cursor.SnowflakeCursor:
+        """Executes a statement, reconnecting once if the session has expired.
+
+        Session tokens are renewed by the connector itself and sessions are
+        kept alive by heartbeats, so this only re-authenticates when the
+        session is gone or can no longer be renewed. Statements aren't
+        retried on a session that had its context or transaction state
+        changed (see ``session_changed``), as the new session wouldn't have
+        it; the expiry is raised instead.
+
+        Args:
+            query: Raw SQL to execute
+            params: Sequence of values to bind to the query's placeholders
+            file_stream: File-like object to upload in place of the local
+                file named in a ``PUT`` statement
+        Returns:
+            Cursor on which the statement has been executed.
+        """
+        kwargs = {'file_stream': file_stream} if file_stream is not None \
+            else {}
+
+        try:
+            cursor = self.conn.cursor().execute(query, params, **kwargs)
+
+        except sf.errors.DatabaseError as e:
+            if e.errno not in SESSION_EXPIRED_ERRNOS:
+                raise
+
+            if self.session_changed:
+                print("<session expired after its context was changed - "
+                      "not retrying on a new session>")
+                self.release(close=True)
+                raise
+
+            print("<session expired - reconnecting>")
+            self.release(close=True)
+            if file_stream is not None:
+                file_stream.seek(0)
+            cursor = self.conn.cursor().execute(query, params, **kwargs)
+
+        self._record(cursor.sfqid, query)
+
+        return cursor
+
+    def _log(self, query: str, sfqid: str, started: float, executed: float,
+             rows: int = None, result_bytes: int = None) -> None:
+        """Records an execution in ``ledger``.
+
+        Args:
+            query: Raw SQL executed
+            sfqid: Query id of the execution
+            started: ``time.perf_counter()`` value before execution
+            executed: ``time.perf_counter()`` value once results were ready
+                to fetch
+            rows: Number of rows returned or affected
+            result_bytes: Size of the results in bytes
+        """
+        if self.ledger is None:
+            return None
+
+        finished = time.perf_counter()
+        self.ledger.record(query, sfqid=sfqid,
+                           conn_name=getattr(self, 'resolved_conn_name',
+                                             self.conn_name),
+                           wall_time=finished - started,
+                           fetch_time=finished - executed, rows=rows,
+                           result_bytes=None if result_bytes is None
+                           else int(result_bytes))
+
+        return None
+
+    def _record(self, sfqid: str, query: str) -> None:
+        """Records the query id of a successfully submitted statement."""
+        self.sfqid = sfqid
+        self.query_ids.append((sfqid, query))
+        if not self.session_changed and snowconn.changes_session(query):
+            self.session_changed = True
+
+        return None
+
     def disconnect(self) -> None:
         """Disconnect from connection with which Connect() was instantiated.
 
+        The session is returned to ``snowconn.pool`` for re-use by other
+        Connector objects under the same credentials rather than closed.
+
         Returns:
             None
 
         """
-        self.conn.close()
+        self.release()
         return None
 
+    def release(self, close: bool = False) -> None:
+        """Returns the session to the pool without establishing one first."""
+        if self._settle() is not None:
+            super().release(close=close)
+
+        return None
+
+    def _settle(self) -> sf.SnowflakeConnection:
+        """Waits on any background connection so its session isn't orphaned.
+
+        Returns:
+            The current session or None if not connected.
+        """
+        with self._conn_lock:
+            if self._pending is not None:
+                pending, self._pending = self._pending, None
+                try:
+                    self._conn = pending.result()
+                except Exception:
+                    self._conn = None
+
+        return self._conn
+
     def commit(self) -> None:
         """Manually commits changes to database in instances when needed.
 
@@ -71,11 +879,258 @@ class Connector(snowconn.Connection):
     def new(self) -> object:
         """Instantiates a new session for the same object.
 
+        The session being replaced is closed.
+
         Returns:
             A snowquery.Connector() under the same set of credentials as the
             originally instantiated object but connected to a new session.
         """
-        self.conn = snowconn.Connection(config_file=self.config_file,
-                                        conn_name=self.conn_name).get_conn()
+        replaced = self._settle()
+        if replaced is not None:
+            # Discarded under the key it was borrowed with, which the new
+            # session's may differ from if the credentials have changed
+            self.pool.discard(self.pool_key, replaced)
+            self.conn = None
+
+        self.get_conn(fresh=True)
 
         return self
+
+
+def compact_frame(df: pd.DataFrame, description: list,
+                  category_ratio: float = CATEGORY_RATIO) -> pd.DataFrame:
+    """Converts columns to the tightest dtypes their result metadata allows.
+
+    (1) Integers (NUMBER with a scale of 0) are downcast to the smallest
+        integer dtype that holds them, nullable if they contain nulls
+    (2) Decimals (NUMBER with a scale) become floats, 32-bit if their
+        precision is 6 digits or fewer
+    (3) Text columns become categorical if the ratio of unique to total
+        values is at or below ``category_ratio``
+    (4) DATE and TIMESTAMP columns become datetime64, in UTC for those with
+        a time zone
+    (5) BOOLEAN columns become bool, nullable if they contain nulls
+
+    Args:
+        df: DataFrame of results as fetched
+        description: ``cursor.description`` of the query the results are from
+        category_ratio: Ratio of unique to total values at or below which a
+            text column is made categorical
+    Returns:
+        DataFrame with converted columns
+
+    """
+    converted = [_compact_column(df.iloc[:, i], col, category_ratio)
+                 for i, col in enumerate(description)]
+    if not converted:
+        return df
+
+    compacted = pd.concat(converted, axis=1, ignore_index=True)
+    compacted.columns = df.columns
+
+    return compacted
+
+
+def arrow_schema(description: list) -> object:
+    """Builds a pyarrow.Schema from a cursor's result metadata.
+
+    Used to give every result batch the same types, as the connector can
+    return narrower types for batches whose values happen to fit them.
+    """
+    import pyarrow as pa
+
+    types = {'REAL': pa.float64(), 'DATE': pa.date32(),
+             'TIMESTAMP_NTZ': pa.timestamp('ns'),
+             'TIMESTAMP_LTZ': pa.timestamp('ns', tz='UTC'),
+             'TIMESTAMP_TZ': pa.timestamp('ns', tz='UTC'),
+             'BOOLEAN': pa.bool_(), 'BINARY': pa.binary()}
+
+    fields = []
+    for col in description:
+        kind = FIELD_ID_TO_NAME.get(col[1], '')
+        if kind == 'FIXED':
+            arrow_type = pa.int64() if not col[5] else \
+                pa.decimal128(col[4] or 38, col[5])
+        else:
+            arrow_type = types.get(kind, pa.string())
+        fields.append(pa.field(col[0], arrow_type))
+
+    return pa.schema(fields)
+
+
+def _compact_column(values: pd.Series, col: tuple,
+                    category_ratio: float) -> pd.Series:
+    """Converts a single column according to its result metadata."""
+    kind = FIELD_ID_TO_NAME.get(col[1], '')
+    precision, scale = col[4], col[5]
+
+    try:
+        if kind == 'FIXED' and not scale:
+            return _downcast_int(pd.to_numeric(values))
+
+        if kind == 'FIXED':
+            return pd.to_numeric(values).astype(
+                'float32' if precision and precision <= 6 else 'float64')
+
+        if kind == 'TEXT' and len(values) and \
+                values.nunique() <= category_ratio * len(values):
+            return values.astype('category')
+
+        if kind in ('DATE', 'TIMESTAMP_NTZ'):
+            return pd.to_datetime(values)
+
+        if kind in ('TIMESTAMP_LTZ', 'TIMESTAMP_TZ'):
+            return pd.to_datetime(values, utc=True)
+
+        if kind == 'BOOLEAN':
+            return values.astype('boolean' if values.isna().any() else bool)
+
+    except (ValueError, TypeError, OverflowError):
+        pass
+
+    return values
+
+
+def _downcast_int(values: pd.Series) -> pd.Series:
+    """Downcasts integers, using a nullable dtype if there are nulls."""
+    if not values.isna().any():
+        return pd.to_numeric(values, downcast='integer')
+
+    low, high = values.min(), values.max()
+    for dtype in ('int8', 'int16', 'int32', 'int64'):
+        if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+            return values.astype(dtype.capitalize())
+
+    return values
+
+
+def _concat_compact(frames: list) -> pd.DataFrame:
+    """Concatenates compacted chunks, unifying categories across chunks."""
+    if len(frames) == 1 or not frames[0].shape[1]:
+        return pd.concat(frames, ignore_index=True)
+
+    merged = []
+    for i in range(frames[0].shape[1]):
+        pieces = [f.iloc[:, i] for f in frames]
+        if any(isinstance(p.dtype, pd.CategoricalDtype) for p in pieces):
+            merged.append(pd.Series(union_categoricals(
+                [p.astype('category') for p in pieces], ignore_order=True)))
+        else:
+            merged.append(pd.concat(pieces, ignore_index=True))
+
+    df = pd.concat(merged, axis=1, ignore_index=True)
+    df.columns = frames[0].columns
+
+    return df
+
+
+def fan_out(query: str, conn_names: list = None,
+            config_file: str = 'snowflake_credentials.json',
+            max_workers: int = 8, source_col: str = 'SOURCE_CONNECTION',
+            stream: bool = False) -> object:
+    """Run the same query against many connections in parallel.
+
+    Each connection's results are tagged with the connection name in
+    ``source_col``; failures are printed and left out of the combined
+    results as with ``Connector.execute_query``.
+
+    .. code-block:: python
+
+        from snowmobile import snowquery
+
+        # All connections in snowflake_credentials.json
+        usage = snowquery.fan_out('select current_account(), count(*) '
+                                  'from sample_table')
+
+        # Process each connection's results as it finishes
+        for conn_name, df, error in snowquery.fan_out(sql, stream=True):
+            ...
+
+    Args:
+        query: Raw SQL to execute.
+        conn_names: Names of connections within the config file to run the
+            query against; defaults to all of them.
+        config_file: Name of .json configuration file following the
+            format of connection_credentials_SAMPLE.json.
+        max_workers: Maximum number of connections to query at once.
+        source_col: Name of the column holding the connection name.
+        stream: Boolean value indicating whether to return a generator of
+            (conn_name, DataFrame, error) tuples as each connection finishes
+            instead of the combined results.
+    Returns:
+        DataFrame of all connections' results or a generator if ``stream``.
+    """
+    conn_names = conn_names or snowcreds.Credentials(
+        config_file=config_file).connection_names()
+
+    executor = futures.ThreadPoolExecutor(
+        max_workers=max(min(max_workers, len(conn_names)), 1))
+    submitted = {
+        executor.submit(_run_tagged, config_file, name, query,
+                        source_col): name
+        for name in conn_names
+    }
+
+    if stream:
+        return _as_completed(executor, submitted)
+
+    returned = {name: (df, error) for name, df, error in
+                _as_completed(executor, submitted)}
+
+    frames = []
+    for name in conn_names:
+        df, error = returned[name]
+        if error is not None:
+            print(f"<{name} failed: {type(error).__name__}>")
+            Connector._print_error(error)
+        else:
+            frames.append(df)
+
+    return pd.concat(frames, ignore_index=True) if frames else \
+        pd.DataFrame()
+
+
+def _run_tagged(config_file: str, conn_name: str, query: str,
+                source_col: str) -> tuple:
+    """Runs a query on its own pooled session and tags it with its source.
+
+    Errors are captured per connection, including an unknown connection
+    name or a result that already has a ``source_col`` column, so that one
+    connection failing doesn't fail the others.
+    """
+    df, error = _run_isolated(config_file, conn_name, query,
+                              snowledger.ledger)
+    if error is None:
+        try:
+            df.insert(0, source_col, conn_name)
+        except Exception as e:
+            df, error = pd.DataFrame(), e
+
+    return df, error
+
+
+def _run_isolated(config_file: str, conn_name: str, query: str,
+                  ledger: snowledger.Ledger) -> tuple:
+    """Runs a query on its own pooled session, capturing any error.
+
+    Returns:
+        Tuple of (DataFrame, error) with an empty DataFrame if the query
+        failed and None as the error if it succeeded
+    """
+    try:
+        with Connector(config_file, conn_name, mode='lazy',
+                       ledger=ledger) as connector:
+            return connector._query_frame(query), None
+
+    # Any error, including one locating credentials or borrowing a session,
+    # is captured so that it only fails this query rather than the batch
+    except Exception as e:
+        return pd.DataFrame(), e
+
+
+def _as_completed(executor: futures.ThreadPoolExecutor,
+                  submitted: dict) -> Iterator[tuple]:
+    """Yields (key, DataFrame, error) tuples as submitted queries finish."""
+    with executor:
+        for future in futures.as_completed(submitted):
+            yield (submitted[future],) + future.result()
@@ -12,6 +12,7 @@ class Statement:
 
         self.sql = sql
         self.connector = connector
+        self.sfqid = ''
 
     def render(self) -> object:
         """Renders SQL as markdown when called in IPython environment.
@@ -32,6 +33,14 @@ class Statement:
 
         return self.sql
 
+    def result_scan(self, **kwargs) -> object:
+        """Re-fetches results of the last execution without re-running it.
+
+        Accepts the keyword arguments of ``snowquery.Connector.result_scan``
+        to filter or page through the results.
+        """
+        return self.connector.result_scan(self.sfqid, **kwargs)
+
     def execute(self, results: bool = True, render: bool = False,
                 describe: bool = False) -> object:
         """Executes sql with option to return results / render sql as Markdown.
@@ -46,6 +55,7 @@ class Statement:
             useful for QA queries that are expected to return null-sets)
         """
         self.returned = self.connector.execute_query(self.sql)
+        self.sfqid = self.connector.sfqid
 
         if render:
             self.render()
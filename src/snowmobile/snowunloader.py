@@ -0,0 +1,182 @@
+from snowmobile import snowquery
+from concurrent import futures
+import pandas as pd
+import tempfile
+import shutil
+import uuid
+import glob
+import os
+
+UNLOAD_FORMATS = {
+    'parquet': "type = parquet compression = snappy",
+    'csv': "type = csv compression = gzip field_delimiter = '|' "
+           "field_optionally_enclosed_by = '\"' null_if = ('')",
+}
+
+RETURN_TYPES = ('pandas', 'arrow', 'paths')
+
+
+def unload_statements(query: str, stage_name: str, local_dir: str,
+                      file_type: str = 'parquet', max_file_size: int =
+                      256 * 2 ** 20, max_workers: int = 8) -> list:
+    """Statements to unload a query's results to a stage and download them.
+
+    Args:
+        query: Raw SQL whose results to unload
+        stage_name: Name of the temporary stage to unload into
+        local_dir: Directory to download the unloaded files into
+        file_type: 'parquet' or 'csv'
+        max_file_size: Upper bound on the size of each unloaded file in bytes
+        max_workers: Number of threads with which to download the files
+    Returns:
+        List of [create stage, copy into stage, get, drop stage] statements
+
+    """
+    get_path = local_dir.replace('\\', '/')
+
+    create_stage = f"create or replace temporary stage {stage_name};"
+
+    # The query is closed on its own line so that a trailing comment in it
+    # doesn't comment out the closing parenthesis
+    copy_into = f"copy into @{stage_name}/unload/\n" \
+                f"from (\n{query.strip().rstrip(';').rstrip()}\n)\n" \
+                f"file_format = ({UNLOAD_FORMATS[file_type]})\n" \
+                f"header = true\n" \
+                f"max_file_size = {max_file_size}\n" \
+                f"overwrite = true;"
+
+    get_files = f"get @{stage_name}/unload/ 'file://{get_path}/' " \
+                f"parallel = {max_workers};"
+
+    drop_stage = f"drop stage if exists {stage_name};"
+
+    return [create_stage, copy_into, get_files, drop_stage]
+
+
+def read_unloaded(paths: list, file_type: str = 'parquet',
+                  returns: str = 'pandas', max_workers: int = 8) -> object:
+    """Reads unloaded files back using multiple cores.
+
+    Args:
+        paths: Paths to the downloaded files
+        file_type: 'parquet' or 'csv'
+        returns: 'pandas' for a DataFrame or 'arrow' for a pyarrow.Table
+        max_workers: Number of threads with which to read csv files
+    Returns:
+        Combined contents of all files
+
+    """
+    if file_type == 'parquet':
+        import pyarrow.dataset as ds
+
+        table = ds.dataset(paths, format='parquet').to_table(
+            use_threads=True)
+        return table if returns == 'arrow' else \
+            table.to_pandas(split_blocks=True, self_destruct=True)
+
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        frames = list(executor.map(
+            lambda path: pd.read_csv(path, sep='|', quotechar='"',
+                                     compression='gzip'), paths))
+
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if returns == 'arrow':
+        import pyarrow as pa
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+    return df
+
+
+def snowflake_to_df(query: str, connector: snowquery.Connector = '',
+                    output_location: str = os.getcwd(),
+                    file_type: str = 'parquet', returns: str = 'pandas',
+                    max_workers: int = 8, max_file_size: int =
+                    256 * 2 ** 20, keep_local: bool = False) -> object:
+    """Extracts a query's results through a bulk unload rather than a cursor.
+
+    The mirror of ``snowloader.df_to_snowflake`` for very large results.
+
+    (1) Unloads the results with ``COPY INTO`` a temporary stage as
+        compressed Parquet or CSV files, written in parallel by the warehouse
+    (2) Downloads the files with a single ``GET`` using ``max_workers``
+        download threads
+    (3) Reads the files back into a DataFrame or pyarrow.Table using
+        multiple cores, or returns their local paths
+    (4) Drops the stage and, unless returning paths or ``keep_local=True``
+        is passed, deletes the local files
+
+    Args:
+        query: Raw SQL whose results to extract
+        connector: Pre-instantiated snowquery.Connector() instance with
+            which to execute the unload
+        output_location: Location to download files into; defaults to
+            current working directory
+        file_type: 'parquet' (requires the ``arrow`` extra) or 'csv'
+        returns: 'pandas' for a DataFrame, 'arrow' for a pyarrow.Table or
+            'paths' for a list of the downloaded files
+        max_workers: Number of threads with which to download and read files
+        max_file_size: Upper bound on the size of each unloaded file in bytes
+        keep_local: Boolean value indicating whether or not to keep the
+            downloaded files
+    Returns:
+        Results in the type given by ``returns`` or None if the unload failed
+
+    """
+    if file_type not in UNLOAD_FORMATS:
+        raise ValueError(f"file_type must be one of {list(UNLOAD_FORMATS)}, "
+                         f"not '{file_type}'")
+    if returns not in RETURN_TYPES:
+        raise ValueError(f"returns must be one of {RETURN_TYPES}, "
+                         f"not '{returns}'")
+
+    borrowed = not connector
+    if borrowed:
+        connector = snowquery.Connector()
+
+    stage_name = f"snowmobile_unload_{uuid.uuid4().hex[:12]}"
+    local_dir = tempfile.mkdtemp(prefix='snowmobile_unload_',
+                                 dir=output_location)
+
+    statements = unload_statements(query, stage_name, local_dir,
+                                   file_type=file_type,
+                                   max_file_size=max_file_size,
+                                   max_workers=max_workers)
+
+    unloaded = True
+    for i, statement in enumerate(statements, start=1):
+
+        connector.execute_query(statement, results=False, use_cache=False)
+
+        if not connector.sfqid:  # only recorded if the statement succeeded
+            print(f"\n<statement {i} of {len(statements)} failed>\n"
+                  f"{statement}\n\n")
+            connector.execute_query(statements[-1])
+            unloaded = False
+            break
+
+        print(f"\n<{i} of {len(statements)} completed>:\n\t{statement}")
+
+    if borrowed:
+        connector.disconnect()
+
+    paths = sorted(glob.glob(os.path.join(local_dir, '**', '*.*'),
+                             recursive=True))
+
+    if not unloaded:
+        returned = None
+
+    elif returns == 'paths':
+        print(f"\n<{len(paths)} file(s) downloaded to {local_dir}>")
+        return paths
+
+    else:
+        returned = read_unloaded(paths, file_type=file_type,
+                                 returns=returns, max_workers=max_workers)
+
+    if keep_local:
+        print(f"\n<Local copy of files saved in {local_dir}>")
+    else:
+        shutil.rmtree(local_dir, ignore_errors=True)
+        print(f"\n<Local copy of files deleted from {local_dir}>")
+
+    return returned
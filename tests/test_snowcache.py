@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+
+import os
+
+import pandas as pd
+import pytest
+from snowmobile import snowcache
+
+__author__ = "Grant E Murray"
+__copyright__ = "Grant E Murray"
+__license__ = "mit"
+
+
+def frame(rows=3):
+    return pd.DataFrame({'A': range(rows), 'B': [f"v{i}" for i in
+                                                 range(rows)]})
+
+
+def test_put_and_get():
+    cache = snowcache.ResultCache()
+    cache.put('k', frame())
+
+    pd.testing.assert_frame_equal(cache.get('k'), frame())
+
+
+def test_lookup_returns_copy():
+    cache = snowcache.ResultCache()
+    cache.put('k', frame())
+
+    df = cache.get('k')
+    df.loc[0, 'A'] = -1
+
+    pd.testing.assert_frame_equal(cache.get('k'), frame())
+
+
+def test_missing_and_expired():
+    cache = snowcache.ResultCache(ttl=0)
+    cache.put('k', frame())
+
+    assert cache.get('k') is None
+    assert cache.get('missing') is None
+
+
+def test_least_recently_used_evicted():
+    size = int(frame().memory_usage(deep=True).sum())
+    cache = snowcache.ResultCache(max_bytes=2 * size)
+
+    cache.put('a', frame())
+    cache.put('b', frame())
+    cache.get('a')
+    cache.put('c', frame())
+
+    assert cache.get('a') is not None
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+
+
+def test_oversized_result_not_cached():
+    cache = snowcache.ResultCache(max_bytes=1)
+    cache.put('k', frame())
+
+    assert cache.get('k') is None
+
+
+def test_invalidate_and_clear():
+    cache = snowcache.ResultCache()
+    cache.put('a', frame())
+    cache.put('b', frame())
+
+    cache.invalidate('a')
+    assert cache.get('a') is None
+    assert cache.get('b') is not None
+
+    cache.clear()
+    assert cache.get('b') is None
+
+
+def test_key_ignores_comments_and_whitespace():
+    key = snowcache.ResultCache.key('select *\n  from t -- all rows\n;')
+
+    assert key == snowcache.ResultCache.key('select * from t')
+    assert key != snowcache.ResultCache.key('select * from t',
+                                            ('ROLE', 'WH', 'DB', 'SCHEMA'))
+
+
+@pytest.mark.parametrize('sql, expected', [
+    ('select * from t', True),
+    ('with x as (select 1) select * from x', True),
+    ('insert into t values (1)', False),
+    ('select 1; drop table t', False),
+])
+def test_cacheable(sql, expected):
+    assert snowcache.ResultCache.cacheable(sql) is expected
+
+
+def test_disk_round_trip(tmp_path):
+    pytest.importorskip('pyarrow')
+    snowcache.ResultCache(directory=str(tmp_path)).put('k', frame())
+
+    df = snowcache.ResultCache(directory=str(tmp_path)).get('k')
+
+    pd.testing.assert_frame_equal(df, frame(), check_dtype=False)
+
+
+def test_unwritable_result_not_cached(tmp_path):
+    pytest.importorskip('pyarrow')
+    cache = snowcache.ResultCache(directory=str(tmp_path))
+    df = pd.DataFrame([[1, 2]], columns=['A', 'A'])
+
+    cache.put('k', df)
+
+    assert cache.get('k') is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_lookup_returns_query_id():
+    cache = snowcache.ResultCache()
+    cache.put('k', frame(), sfqid='qid')
+
+    df, sfqid = cache.lookup('k')
+
+    pd.testing.assert_frame_equal(df, frame())
+    assert sfqid == 'qid'
+    assert cache.lookup('missing') == (None, '')
+
+
+def test_query_id_kept_on_disk(tmp_path):
+    pytest.importorskip('pyarrow')
+    snowcache.ResultCache(directory=str(tmp_path)).put('k', frame(),
+                                                       sfqid='qid')
+
+    df, sfqid = snowcache.ResultCache(directory=str(tmp_path)).lookup('k')
+
+    pd.testing.assert_frame_equal(df, frame(), check_dtype=False)
+    assert sfqid == 'qid'
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from snowmobile import snowconn
+
+__author__ = "Grant E Murray"
+__copyright__ = "Grant E Murray"
+__license__ = "mit"
+
+KEY = snowconn.ConnectionPool.key({'username': 'user', 'role': 'ANALYST',
+                                   'database': 'SANDBOX', 'schema': 'PUBLIC'})
+
+
+class StandInConnection:
+    """Session with the interface the pool uses."""
+    def __init__(self, role='ANALYST', database='SANDBOX', schema='PUBLIC'):
+        self.role, self.database, self.schema = role, database, schema
+        self.warehouse = None
+        self.closed = False
+        self.pings = 0
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+    def cursor(self):
+        return self
+
+    def execute(self, query):
+        self.pings += 1
+        return self
+
+
+class Connect:
+    """Callable counting the sessions it opens."""
+    def __init__(self):
+        self.opened = []
+
+    def __call__(self):
+        conn = StandInConnection()
+        self.opened.append(conn)
+        return conn
+
+
+def test_checkout_reuses_idle_session():
+    pool, connect = snowconn.ConnectionPool(), Connect()
+
+    conn = pool.checkout(KEY, connect)
+    pool.checkin(KEY, conn)
+
+    assert pool.checkout(KEY, connect) is conn
+    assert len(connect.opened) == 1
+
+
+def test_checkout_fresh_opens_new_session():
+    pool, connect = snowconn.ConnectionPool(), Connect()
+
+    conn = pool.checkout(KEY, connect)
+    pool.checkin(KEY, conn)
+
+    assert pool.checkout(KEY, connect, fresh=True) is not conn
+    assert len(connect.opened) == 2
+
+
+def test_checkout_beyond_max_size_opens_unpooled_session():
+    pool, connect = snowconn.ConnectionPool(max_size=1, timeout=0.01), \
+        Connect()
+
+    pooled = pool.checkout(KEY, connect)
+    unpooled = pool.checkout(KEY, connect)
+
+    assert unpooled is not pooled
+    pool.checkin(KEY, unpooled)
+    assert unpooled.closed
+    assert not pool._idle.get(KEY)
+
+    pool.checkin(KEY, pooled)
+    assert pool.checkout(KEY, connect) is pooled
+
+
+def test_checkin_discards_session_out_of_context():
+    pool = snowconn.ConnectionPool()
+    connect = Connect()
+
+    conn = pool.checkout(KEY, connect)
+    conn.database = 'OTHER'
+    pool.checkin(KEY, conn)
+
+    assert conn.closed
+    assert pool.checkout(KEY, connect) is not conn
+    assert pool._open[KEY] == 1
+
+
+def test_checkin_closed_session_frees_slot():
+    pool, connect = snowconn.ConnectionPool(max_size=1), Connect()
+
+    conn = pool.checkout(KEY, connect)
+    conn.close()
+    pool.checkin(KEY, conn)
+
+    assert pool._open[KEY] == 0
+    assert pool.checkout(KEY, connect, timeout=0) is not conn
+
+
+def test_idle_sessions_pinged_and_evicted():
+    pool, connect = snowconn.ConnectionPool(ping_after=0), Connect()
+
+    conn = pool.checkout(KEY, connect)
+    pool.checkin(KEY, conn)
+    assert pool.checkout(KEY, connect) is conn
+    assert conn.pings == 1
+
+    pool.idle_timeout = 0
+    pool.checkin(KEY, conn)
+    assert pool.checkout(KEY, connect) is not conn
+    assert conn.closed
+
+
+def test_failed_connect_frees_slot():
+    pool = snowconn.ConnectionPool(max_size=1)
+
+    def fail():
+        raise RuntimeError('authentication failed')
+
+    with pytest.raises(RuntimeError):
+        pool.checkout(KEY, fail)
+
+    assert pool._open[KEY] == 0
+
+
+@pytest.mark.parametrize('sql, expected', [
+    ('use warehouse big_wh', True),
+    ('alter session set timezone = utc', True),
+    ('-- comment\ncreate temporary table t (a int)', True),
+    ('create or replace temp table t (a int)', True),
+    ('begin', True),
+    ('select * from settings', False),
+    ('create table t (a int)', False),
+    ('alter table t add column b int', False),
+])
+def test_changes_session(sql, expected):
+    assert snowconn.changes_session(sql) is expected
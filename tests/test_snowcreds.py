@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+import os
+import json
+
+import pytest
+from snowmobile import snowcreds
+
+__author__ = "Grant E Murray"
+__copyright__ = "Grant E Murray"
+__license__ = "mit"
+
+CONFIG_FILE = 'snowflake_credentials.json'
+
+
+@pytest.fixture(autouse=True)
+def empty_store(monkeypatch):
+    monkeypatch.delenv(snowcreds.CONFIG_PATH_ENV, raising=False)
+    monkeypatch.delenv(snowcreds.SEARCH_PATH_ENV, raising=False)
+    snowcreds.clear_store()
+    yield
+    snowcreds.clear_store()
+
+
+def write_config(directory, username='user'):
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / CONFIG_FILE
+    path.write_text(json.dumps({'SANDBOX': {'username': username}}))
+    return str(path)
+
+
+def credentials(cache=None):
+    return snowcreds.Credentials(config_file=CONFIG_FILE,
+                                 cache={} if cache is None else cache)
+
+
+def test_walk_finds_config_breadth_first(tmp_path):
+    write_config(tmp_path / 'a' / 'b' / 'c', username='deep')
+    shallow = write_config(tmp_path / 'z', username='shallow')
+
+    assert credentials().walk_for_config(str(tmp_path)) == shallow
+
+
+def test_walk_stops_at_max_depth(tmp_path):
+    path = write_config(tmp_path / 'a' / 'b' / 'c')
+
+    assert credentials().walk_for_config(str(tmp_path), max_depth=2) == ''
+    assert credentials().walk_for_config(str(tmp_path), max_depth=3) == path
+
+
+@pytest.mark.parametrize('skipped', ['node_modules', '.git', 'site-packages'])
+def test_walk_skips_skip_dirs(tmp_path, skipped):
+    assert skipped in snowcreds.SKIP_DIRS
+    write_config(tmp_path / skipped)
+
+    assert credentials().walk_for_config(str(tmp_path)) == ''
+
+
+def test_walk_skips_virtual_environments(tmp_path):
+    (tmp_path / 'project_env').mkdir()
+    (tmp_path / 'project_env' / 'pyvenv.cfg').write_text('')
+    write_config(tmp_path / 'project_env' / 'lib')
+
+    assert credentials().walk_for_config(str(tmp_path)) == ''
+
+
+def test_walk_gives_up_after_time_limit(tmp_path):
+    write_config(tmp_path)
+
+    assert credentials().walk_for_config(str(tmp_path), time_limit=-1) == ''
+
+
+def test_env_path_takes_precedence_over_cached_path(tmp_path, monkeypatch):
+    cached = write_config(tmp_path / 'cached', username='cached')
+    explicit = write_config(tmp_path / 'explicit', username='explicit')
+    cache = {'config_index': {CONFIG_FILE: cached}, 'path_to_config': cached}
+
+    assert credentials(cache).get()['username'] == 'cached'
+
+    monkeypatch.setenv(snowcreds.CONFIG_PATH_ENV, explicit)
+    found = credentials(cache)
+
+    assert found.get()['username'] == 'explicit'
+    assert found.path_to_config == explicit
+
+
+def test_search_path_env_checked_before_cached_path(tmp_path, monkeypatch):
+    cached = write_config(tmp_path / 'cached', username='cached')
+    write_config(tmp_path / 'searched', username='searched')
+    cache = {'config_index': {CONFIG_FILE: cached}}
+
+    monkeypatch.setenv(snowcreds.SEARCH_PATH_ENV,
+                       str(tmp_path / 'missing') + os.pathsep +
+                       str(tmp_path / 'searched'))
+
+    assert credentials(cache).get()['username'] == 'searched'
+
+
+def test_parsed_credentials_reused_until_file_changes(tmp_path, monkeypatch):
+    path = write_config(tmp_path, username='before')
+    monkeypatch.setenv(snowcreds.CONFIG_PATH_ENV, path)
+    assert credentials().get()['username'] == 'before'
+
+    reads = []
+    original = json.load
+    monkeypatch.setattr(json, 'load', lambda f: reads.append(f) or
+                        original(f))
+
+    assert credentials().get()['username'] == 'before'
+    assert reads == []
+
+    write_config(tmp_path, username='after')
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+
+    assert credentials().get()['username'] == 'after'
+    assert len(reads) == 1
+
+
+def test_clear_store_forces_reread(tmp_path, monkeypatch):
+    path = write_config(tmp_path, username='before')
+    monkeypatch.setenv(snowcreds.CONFIG_PATH_ENV, path)
+    credentials().get()
+
+    stat = os.stat(path)
+    write_config(tmp_path, username='after')
+    os.utime(path, (stat.st_atime, stat.st_mtime))
+    assert credentials().get()['username'] == 'before'
+
+    snowcreds.clear_store()
+    assert credentials().get()['username'] == 'after'
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from snowmobile import snowledger
+
+__author__ = "Grant E Murray"
+__copyright__ = "Grant E Murray"
+__license__ = "mit"
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    return snowledger.Ledger(str(tmp_path / 'ledger.sqlite'))
+
+
+def test_record_and_history(ledger):
+    ledger.record('select 1', sfqid='q1', conn_name='c', wall_time=1.0,
+                  fetch_time=0.5, rows=1, result_bytes=8)
+    ledger.record('select 2', sfqid='q2', conn_name='c', wall_time=2.0)
+
+    history = ledger.history()
+
+    assert list(history['sfqid']) == ['q2', 'q1']
+    assert list(history['sql']) == ['select 2', 'select 1']
+
+
+def test_statements_stored_once_per_hash(ledger):
+    ledger.record('select  1', wall_time=1.0)
+    ledger.record('select 1\n', wall_time=3.0)
+
+    summary = ledger.summary()
+
+    assert len(summary) == 1
+    assert summary.loc[0, 'executions'] == 2
+    assert summary.loc[0, 'avg_wall_time'] == 2.0
+    assert summary.loc[0, 'sql'] == 'select  1'
+
+
+def test_slowest_and_most_frequent(ledger):
+    ledger.record('select 1', wall_time=1.0)
+    ledger.record('select 1', wall_time=1.0)
+    ledger.record('select 2', wall_time=5.0)
+
+    assert ledger.slowest(1).loc[0, 'sql'] == 'select 2'
+    assert ledger.most_frequent(1).loc[0, 'sql'] == 'select 1'
+
+
+def test_summary_rejects_unknown_order(ledger):
+    with pytest.raises(ValueError):
+        ledger.summary(order_by='sql; drop table queries')
+
+
+def test_record_failure_reported_once(tmp_path, capsys):
+    blocker = tmp_path / 'file'
+    blocker.write_text('')
+    ledger = snowledger.Ledger(str(blocker / 'ledger.sqlite'))
+
+    ledger.record('select 1')
+    ledger.record('select 1')
+
+    assert capsys.readouterr().out.count('could not record to ledger') == 1
+
+
+def test_sql_hash_normalizes_whitespace():
+    assert snowledger.sql_hash('select\n  1') == snowledger.sql_hash(
+        'select 1')
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+
+import io
+import os
+import datetime
+
+import pandas as pd
+import pytest
+from snowmobile import snowloader
+
+__author__ = "Grant E Murray"
+__copyright__ = "Grant E Murray"
+__license__ = "mit"
+
+
+class StandInConnector:
+    """Connector answering INFORMATION_SCHEMA lookups from ``tables``."""
+    conn_name = 'stand_in'
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.queries = []
+        self.sfqid = ''
+
+    def _session_context(self):
+        return 'ROLE', 'WH', 'DB', 'SCHEMA'
+
+    def execute_query(self, query, use_cache=True, params=None, **kwargs):
+        self.queries.append(query)
+        self.sfqid = f"qid-{len(self.queries)}"
+        rows = [(table_name, i, col) for table_name in params
+                for i, col in enumerate(self.tables.get(table_name, []),
+                                        start=1)]
+        return pd.DataFrame(rows, columns=['TABLE_NAME', 'ORDINAL_POSITION',
+                                           'COLUMN_NAME'])
+
+
+@pytest.fixture(autouse=True)
+def empty_table_cache():
+    snowloader.invalidate_table()
+    yield
+    snowloader.invalidate_table()
+
+
+def test_check_information_schema_caches_columns():
+    sf = StandInConnector({'T': ['A', 'LOADED_TMSTMP']})
+
+    assert snowloader.check_information_schema('T', sf) == \
+        ['A', 'LOADED_TMSTMP']
+    assert snowloader.check_information_schema('T', sf) == \
+        ['A', 'LOADED_TMSTMP']
+    assert len(sf.queries) == 1
+
+    snowloader.check_information_schema('T', sf, use_cache=False)
+    assert len(sf.queries) == 2
+
+
+def test_missing_table_looked_up_again():
+    sf = StandInConnector({})
+
+    assert snowloader.check_information_schema('T', sf) == []
+    sf.tables['T'] = ['A']
+
+    assert snowloader.check_information_schema('T', sf) == ['A']
+    assert len(sf.queries) == 2
+
+
+def test_invalidate_table():
+    sf = StandInConnector({'T': ['A'], 'U': ['B']})
+    snowloader.check_information_schema('T', sf)
+    snowloader.check_information_schema('U', sf)
+
+    snowloader.invalidate_table('T')
+    snowloader.check_information_schema('T', sf)
+    snowloader.check_information_schema('U', sf)
+    assert len(sf.queries) == 3
+
+    snowloader.invalidate_table()
+    snowloader.check_information_schema('U', sf)
+    assert len(sf.queries) == 4
+
+
+def test_prefetch_tables_caches_existing_tables_only():
+    sf = StandInConnector({'T': ['A', 'B']})
+
+    assert snowloader.prefetch_tables(['T', 'MISSING', 'T'], sf) == \
+        {'T': ['A', 'B'], 'MISSING': []}
+    assert len(sf.queries) == 1
+
+    assert snowloader.check_information_schema('T', sf) == ['A', 'B']
+    assert len(sf.queries) == 1
+
+    assert snowloader.check_information_schema('MISSING', sf) == []
+    assert len(sf.queries) == 2
+
+
+def test_write_parts_splits_rows_across_processes(tmp_path):
+    df = pd.DataFrame({'A': range(5), 'B': list('vwxyz')})
+    loaded_tmstmp = datetime.datetime(2020, 1, 1, 12, 30)
+
+    paths = snowloader.write_parts(df, str(tmp_path / 'parts'), chunk_rows=2,
+                                   max_workers=2, loaded_tmstmp=loaded_tmstmp)
+
+    assert [os.path.basename(path) for path in paths] == \
+        ['part_00000.csv.gz', 'part_00001.csv.gz', 'part_00002.csv.gz']
+    parts = [pd.read_csv(path, sep='|', header=None, names=['A', 'B', 'T'])
+             for path in paths]
+    assert [len(part) for part in parts] == [2, 2, 1]
+    loaded = pd.concat(parts, ignore_index=True)
+    assert list(loaded['A']) == list(df['A'])
+    assert set(loaded['T']) == {'2020-01-01 12:30:00'}
+
+
+@pytest.mark.parametrize('col, expected', [
+    ('first name', 'FIRST_NAME'),
+    (' id ', 'ID'),
+    ('_amount_', 'AMOUNT'),
+    ('rate (%)', 'RATE_'),
+    ('already_STANDARD', 'ALREADY_STANDARD'),
+])
+def test_standardize_col(col, expected):
+    assert snowloader.standardize_col(col) == expected
+
+
+def test_snowflake_columns_replace_existing_loaded_tmstmp():
+    assert snowloader.snowflake_columns(['a', 'loaded tmstmp', 'b']) == \
+        ['A', 'B', 'LOADED_TMSTMP']
+
+
+def test_load_template_leaves_df_unmodified():
+    df = pd.DataFrame({'first name': [1, 2], 'LOADED_TMSTMP': [3, 4]})
+
+    template = snowloader.load_template(df)
+
+    assert list(template.columns) == ['FIRST_NAME', 'LOADED_TMSTMP']
+    assert template.empty
+    assert list(df.columns) == ['first name', 'LOADED_TMSTMP']
+
+
+def test_object_sql_types_use_every_value():
+    df = pd.DataFrame({'mixed': [1] * 2000 + ['text'],
+                       'ints': pd.Series([1] * 2001, dtype=object),
+                       'floats': [1.5] * 2001,
+                       'loaded_tmstmp': ['2020-01-01'] * 2001})
+
+    assert snowloader.object_sql_types(df) == {'MIXED': 'TEXT',
+                                               'INTS': 'INTEGER'}
+
+
+def test_get_ddl_from_template_matches_full_frame():
+    df = pd.DataFrame({'mixed': [1] * 2000 + ['text'],
+                       'ints': pd.Series([1] * 2001, dtype=object),
+                       'when': pd.Timestamp('2020-01-01')})
+
+    assert snowloader.get_ddl(snowloader.load_template(df), 'T',
+                              dtype=snowloader.object_sql_types(df)) == \
+        snowloader.get_ddl(snowloader.rename_cols_for_snowflake(df), 'T')
+
+
+def test_serialize_part_replaces_existing_loaded_tmstmp():
+    pq = pytest.importorskip('pyarrow.parquet')
+    df = pd.DataFrame({'a': [1, 2], 'LOADED_TMSTMP': ['old', 'old'],
+                       'b': ['x', 'y']})
+
+    data = snowloader.serialize_part(
+        df, file_type='parquet', columns=['A', 'B'],
+        loaded_tmstmp=datetime.datetime(2020, 1, 1))
+    table = pq.read_table(io.BytesIO(data))
+
+    assert table.column_names == ['A', 'B', 'LOADED_TMSTMP']
+    assert list(df.columns) == ['a', 'LOADED_TMSTMP', 'b']
+
+
+def test_write_csv_replaces_existing_loaded_tmstmp():
+    df = pd.DataFrame({'a': [1], 'loaded tmstmp': ['old'], 'b': ['x']})
+    handle = io.StringIO()
+
+    snowloader.write_csv(df, handle,
+                         loaded_tmstmp=datetime.datetime(2020, 1, 1, 12))
+
+    assert handle.getvalue() == '"1"|"x"|"2020-01-01 12:00:00"\n'
+
+
+def test_iter_batches_frames():
+    df = pd.DataFrame({'A': [1, 2]})
+
+    assert [batch is df for batch in snowloader.iter_batches(df)] == [True]
+    assert len(list(snowloader.iter_batches(iter([df, df])))) == 2
+
+
+def test_iter_batches_csv_glob(tmp_path):
+    pd.DataFrame({'A': range(3)}).to_csv(tmp_path / 'b.csv', index=False)
+    pd.DataFrame({'A': range(3, 5)}).to_csv(tmp_path / 'a.csv', index=False)
+
+    batches = list(snowloader.iter_batches(str(tmp_path / '*.csv'),
+                                           batch_rows=2))
+
+    assert [list(batch['A']) for batch in batches] == [[3, 4], [0, 1], [2]]
+
+
+def test_iter_batches_parquet(tmp_path):
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'data.parquet')
+    pd.DataFrame({'A': range(5)}).to_parquet(path)
+
+    batches = list(snowloader.iter_batches(path, batch_rows=2))
+
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+
+
+def test_stage_statements_per_load_stage():
+    create, copy, drop = snowloader.stage_statements('T', on_error='abort')
+
+    assert create == "create or replace stage T_stage file_format " \
+                     "= csv_gem7318;"
+    assert copy == "copy into T\nfrom @T_stage\non_error = 'abort';"
+    assert drop == "drop stage T_stage;"
+
+
+def test_stage_statements_parquet():
+    create, copy, _ = snowloader.stage_statements('T', file_type='parquet')
+
+    assert f"({snowloader.PARQUET_FORMAT})" in create
+    assert 'match_by_column_name = case_insensitive' in copy
+
+
+def test_stage_statements_managed_stage():
+    create, copy, drop = snowloader.stage_statements(
+        'T', stage='LOADS', prefix='T/abc')
+
+    assert create == "create stage if not exists LOADS;"
+    assert copy.startswith("copy into T\nfrom @LOADS/T/abc/\n")
+    assert 'purge = true' in copy
+    assert drop == "remove @LOADS/T/abc/;"
+
+
+class ListingConnector:
+    """Connector listing ``files`` on a stage as (name, last modified)."""
+    def __init__(self, files):
+        self.files = files
+        self.queries = []
+
+    def execute_query(self, query, **kwargs):
+        self.queries.append(query)
+        return pd.DataFrame(self.files, columns=['name', 'last_modified'])
+
+
+def test_collect_stage_garbage_removes_stale_loads_only():
+    now = pd.Timestamp.now(tz='UTC')
+    stale = (now - pd.Timedelta(days=2)).strftime('%a, %d %b %Y %H:%M:%S GMT')
+    fresh = now.strftime('%a, %d %b %Y %H:%M:%S GMT')
+    sf = ListingConnector([('loads/T/old/part_0.csv.gz', stale),
+                           ('loads/T/old/part_1.csv.gz', stale),
+                           ('loads/T/new/part_0.csv.gz', stale),
+                           ('loads/T/new/part_1.csv.gz', fresh)])
+
+    assert snowloader.collect_stage_garbage('LOADS', sf) == 1
+    assert sf.queries == ['list @LOADS;', 'remove @LOADS/T/old/;']
+
+
+def test_copied_rows():
+    response = pd.DataFrame({'file': ['a', 'b'], 'rows_loaded': [2, 3]})
+
+    assert snowloader.copied_rows(response) == 5
+    assert snowloader.copied_rows(pd.DataFrame(
+        {'status': ['Copy executed with 0 files processed.']})) == 0
@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+import pandas as pd
+import pytest
+import snowflake.connector as sf
+from snowflake.connector.constants import FIELD_ID_TO_NAME
+from snowmobile import snowconn
+from snowmobile import snowquery
+
+__author__ = "Grant E Murray"
+__copyright__ = "Grant E Murray"
+__license__ = "mit"
+
+FIELD_IDS = {name: field_id for field_id, name in FIELD_ID_TO_NAME.items()}
+
+
+class StandInCursor:
+    """Cursor with the interface ``aexecute_query`` uses."""
+    description = [('A',), ('B',)]
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.sfqid = None
+
+    def execute_async(self, query):
+        self.sfqid = f"qid-{len(self.connection.submitted)}"
+        self.connection.submitted.append(query)
+
+    def execute(self, query):
+        self.connection.executed.append(query)
+        return self
+
+    def get_results_from_sfqid(self, sfqid):
+        self.connection.fetched.append(sfqid)
+
+    def fetchall(self):
+        return [(1, 'x'), (2, 'y')]
+
+
+class StandInConnection:
+    """Connection reporting a query as running for ``polls`` status checks,
+    or forever if ``polls`` is None, before finishing or raising ``error``."""
+    def __init__(self, polls=0, error=None):
+        self.polls = polls
+        self.error = error
+        self.checks = 0
+        self.submitted, self.executed, self.fetched = [], [], []
+
+    def cursor(self):
+        return StandInCursor(self)
+
+    def get_query_status_throw_if_error(self, sfqid):
+        self.checks += 1
+        if self.polls is None or self.checks <= self.polls:
+            return 'RUNNING'
+        if self.error:
+            raise self.error
+        return 'SUCCESS'
+
+    @staticmethod
+    def is_still_running(status):
+        return status == 'RUNNING'
+
+
+def connector(conn):
+    sf_conn = snowquery.Connector(mode='lazy', ledger=None)
+    sf_conn.conn = conn
+    return sf_conn
+
+
+def test_aexecute_query_polls_until_finished():
+    conn = StandInConnection(polls=3)
+    sf_conn = connector(conn)
+
+    df = asyncio.run(sf_conn.aexecute_query('select 1', poll_interval=0))
+
+    assert conn.checks == 4
+    assert conn.fetched == ['qid-0']
+    assert list(df.columns) == ['A', 'B']
+    assert len(df) == 2
+    assert sf_conn.sfqid == 'qid-0'
+    assert conn.executed == []
+
+
+def test_aexecute_query_results_false():
+    sf_conn = connector(StandInConnection())
+
+    assert asyncio.run(sf_conn.aexecute_query('select 1', results=False,
+                                              poll_interval=0)) is None
+
+
+def test_aexecute_query_timeout_cancels_query():
+    conn = StandInConnection(polls=None)
+    sf_conn = connector(conn)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(sf_conn.aexecute_query('select 1', timeout=0.05,
+                                           poll_interval=0.01))
+
+    assert conn.checks > 1
+    assert conn.fetched == []
+    assert conn.executed == ["select system$cancel_query('qid-0')"]
+
+
+def test_aexecute_query_captures_error():
+    error = sf.errors.ProgrammingError(msg='SQL compilation error',
+                                       errno=1003, sqlstate='42000',
+                                       sfqid='qid-0')
+    conn = StandInConnection(polls=1, error=error)
+    sf_conn = connector(conn)
+
+    df = asyncio.run(sf_conn.aexecute_query('select bad', poll_interval=0))
+
+    assert df.empty
+    assert conn.fetched == []
+    assert conn.executed == []
+
+
+def test_aexecute_query_concurrent():
+    conn = StandInConnection(polls=2)
+    sf_conn = connector(conn)
+
+    async def run_all():
+        return await asyncio.gather(
+            *(sf_conn.aexecute_query(f"select {i}", poll_interval=0)
+              for i in range(3)))
+
+    frames = asyncio.run(run_all())
+
+    assert len(frames) == 3
+    assert sorted(conn.submitted) == ['select 0', 'select 1', 'select 2']
+
+
+def description(*kinds):
+    """cursor.description entries of (name, type, ..., precision, scale)."""
+    return [(f"C{i}", FIELD_IDS[kind], None, None, precision, scale, True)
+            for i, (kind, precision, scale) in enumerate(kinds)]
+
+
+def test_compact_frame_integers():
+    df = pd.DataFrame({'C0': [1, 2, 3], 'C1': [1, None, 300]})
+
+    compacted = snowquery.compact_frame(
+        df, description(('FIXED', 38, 0), ('FIXED', 38, 0)))
+
+    assert compacted['C0'].dtype == 'int8'
+    assert compacted['C1'].dtype == 'Int16'
+    assert compacted['C1'].isna().sum() == 1
+
+
+def test_compact_frame_decimals():
+    df = pd.DataFrame({'C0': ['1.5', '2.25'], 'C1': ['1.5', '2.25']})
+
+    compacted = snowquery.compact_frame(
+        df, description(('FIXED', 6, 2), ('FIXED', 38, 2)))
+
+    assert compacted['C0'].dtype == 'float32'
+    assert compacted['C1'].dtype == 'float64'
+
+
+def test_compact_frame_text_categories():
+    df = pd.DataFrame({'C0': ['a', 'a', 'a', 'b'],
+                       'C1': ['a', 'b', 'c', 'd']})
+
+    compacted = snowquery.compact_frame(
+        df, description(('TEXT', None, None), ('TEXT', None, None)))
+
+    assert isinstance(compacted['C0'].dtype, pd.CategoricalDtype)
+    assert not isinstance(compacted['C1'].dtype, pd.CategoricalDtype)
+
+
+def test_compact_frame_dates_and_booleans():
+    df = pd.DataFrame({'C0': ['2020-01-01', '2020-01-02'],
+                       'C1': ['2020-01-01 00:00:00+01:00',
+                              '2020-01-01 00:00:00+02:00'],
+                       'C2': [True, None]})
+
+    compacted = snowquery.compact_frame(
+        df, description(('DATE', None, None), ('TIMESTAMP_TZ', None, None),
+                        ('BOOLEAN', None, None)))
+
+    assert pd.api.types.is_datetime64_any_dtype(compacted['C0'])
+    assert str(compacted['C1'].dt.tz) == 'UTC'
+    assert compacted['C2'].dtype == 'boolean'
+
+
+def test_compact_frame_keeps_unconvertible_values():
+    df = pd.DataFrame({'A': ['x', 'y']})
+
+    compacted = snowquery.compact_frame(df, description(('FIXED', 38, 0)))
+
+    assert list(compacted.columns) == ['A']
+    assert list(compacted['A']) == ['x', 'y']
+
+
+def test_concat_compact_unifies_categories():
+    first = pd.DataFrame({'A': pd.Categorical(['a', 'a']), 'B': [1, 2]})
+    second = pd.DataFrame({'A': ['b', 'c'], 'B': [3, 4]})
+
+    df = snowquery._concat_compact([first, second])
+
+    assert isinstance(df['A'].dtype, pd.CategoricalDtype)
+    assert list(df['A']) == ['a', 'a', 'b', 'c']
+    assert list(df['B']) == [1, 2, 3, 4]
+
+
+class ExpiringConnection:
+    """Session whose statements fail as expired if ``expired`` is set."""
+    def __init__(self, expired=False):
+        self.expired = expired
+        self.executed = []
+        self.closed = False
+        self.sfqid = None
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, params=None, **kwargs):
+        if self.expired:
+            raise sf.errors.DatabaseError(msg='Session no longer exists',
+                                          errno=390111)
+        self.executed.append(query)
+        self.sfqid = f"qid-{len(self.executed)}"
+        return self
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+def expiring_connector():
+    sf_conn = connector(ExpiringConnection(expired=True))
+    sf_conn.pool, sf_conn.pool_key = snowconn.ConnectionPool(), ('key',)
+    renewed = ExpiringConnection()
+
+    def get_conn(fresh=False):
+        sf_conn.conn = renewed
+        return renewed
+
+    sf_conn.get_conn = get_conn
+    return sf_conn, renewed
+
+
+def test_expired_session_retried_on_new_session():
+    sf_conn, renewed = expiring_connector()
+
+    sf_conn._execute('insert into t values (1)')
+
+    assert renewed.executed == ['insert into t values (1)']
+    assert sf_conn.sfqid == 'qid-1'
+
+
+def test_expired_session_not_retried_after_context_change():
+    sf_conn, renewed = expiring_connector()
+    sf_conn._record('qid-0', 'use schema staging')
+
+    with pytest.raises(sf.errors.DatabaseError):
+        sf_conn._execute('insert into t values (1)')
+
+    assert renewed.executed == []
+    assert not sf_conn.session_changed
+
+
+class StandInPooledConnector:
+    """Connector that ``_run_isolated`` opens for each query, answering
+    each with a one-row frame unless the query or connection name asks it
+    to fail."""
+    def __init__(self, config_file='', conn_name='', mode='eager',
+                 ledger=None):
+        if conn_name == 'missing':
+            raise KeyError(conn_name)
+        self.conn_name = conn_name
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+    def _query_frame(self, query):
+        if 'bad_table' in query:
+            raise sf.errors.ProgrammingError(msg='Object does not exist',
+                                             errno=2003)
+        if 'bad_result' in query:
+            raise KeyError('COLUMN')
+        return pd.DataFrame({'QUERY': [query], 'CONN': [self.conn_name]})
+
+    _print_error = snowquery.Connector._print_error
+
+
+@pytest.fixture
+def batch_connector(monkeypatch):
+    sf_conn = snowquery.Connector(mode='lazy', ledger=None)
+    monkeypatch.setattr(snowquery, 'Connector', StandInPooledConnector)
+    return sf_conn
+
+
+def test_execute_batch_in_order(batch_connector):
+    frames = batch_connector.execute_batch(['select 1', 'select 2'])
+
+    assert [df.loc[0, 'QUERY'] for df in frames] == ['select 1', 'select 2']
+    assert batch_connector.batch_errors == {}
+
+
+def test_execute_batch_captures_every_error(batch_connector):
+    frames = batch_connector.execute_batch({
+        'ok': 'select 1',
+        'missing': 'select * from bad_table',
+        'unexpected': 'select bad_result',
+    })
+
+    assert list(frames) == ['ok', 'missing', 'unexpected']
+    assert len(frames['ok']) == 1
+    assert frames['missing'].empty and frames['unexpected'].empty
+    assert isinstance(batch_connector.batch_errors['missing'],
+                      sf.errors.ProgrammingError)
+    assert isinstance(batch_connector.batch_errors['unexpected'], KeyError)
+    assert 'ok' not in batch_connector.batch_errors
+
+
+def test_execute_batch_as_completed(batch_connector):
+    completed = batch_connector.execute_batch(
+        ['select 1', 'select * from bad_table'], ordered=False)
+
+    results = {key: (df, error) for key, df, error in completed}
+
+    assert results[0][1] is None
+    assert results[1][0].empty
+    assert isinstance(results[1][1], sf.errors.ProgrammingError)
+
+
+def test_fan_out_tags_and_combines_results(monkeypatch):
+    monkeypatch.setattr(snowquery, 'Connector', StandInPooledConnector)
+
+    df = snowquery.fan_out('select 1', conn_names=['first', 'second'])
+
+    assert list(df.columns) == ['SOURCE_CONNECTION', 'QUERY', 'CONN']
+    assert list(df['SOURCE_CONNECTION']) == ['first', 'second']
+
+
+def test_fan_out_leaves_out_failed_connections(monkeypatch):
+    monkeypatch.setattr(snowquery, 'Connector', StandInPooledConnector)
+
+    df = snowquery.fan_out('select 1', conn_names=['first', 'missing'])
+
+    assert list(df['SOURCE_CONNECTION']) == ['first']
+
+
+def test_fan_out_captures_existing_source_col(monkeypatch):
+    monkeypatch.setattr(snowquery, 'Connector', StandInPooledConnector)
+
+    df = snowquery.fan_out('select 1', conn_names=['first'],
+                           source_col='CONN')
+
+    assert df.empty
+
+
+def test_fan_out_stream(monkeypatch):
+    monkeypatch.setattr(snowquery, 'Connector', StandInPooledConnector)
+
+    completed = snowquery.fan_out('select 1', conn_names=['first', 'missing'],
+                                  stream=True)
+    results = {name: (df, error) for name, df, error in completed}
+
+    assert results['first'][1] is None
+    assert list(results['first'][0]['SOURCE_CONNECTION']) == ['first']
+    assert results['missing'][0].empty
+    assert isinstance(results['missing'][1], KeyError)
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+
+import pytest
+from snowmobile import snowunloader
+
+__author__ = "Grant E Murray"
+__copyright__ = "Grant E Murray"
+__license__ = "mit"
+
+
+@pytest.mark.parametrize('query', [
+    'select * from t',
+    'select * from t;',
+    'select * from t -- all rows',
+    'select * from t -- all rows\n;',
+])
+def test_unload_statements_close_query_on_own_line(query):
+    _, copy_into, _, _ = snowunloader.unload_statements(query, 'S', '/tmp')
+
+    lines = copy_into.split('\n')
+    assert lines[:2] == ['copy into @S/unload/', 'from (']
+    assert lines[2].startswith('select * from t')
+    assert not lines[2].endswith(';')
+    assert lines[3] == ')'
+
+
+def test_unload_statements_paths_and_format():
+    statements = snowunloader.unload_statements(
+        'select 1', 'S', 'C:\\data', file_type='csv', max_workers=4)
+
+    assert statements[0] == 'create or replace temporary stage S;'
+    assert snowunloader.UNLOAD_FORMATS['csv'] in statements[1]
+    assert statements[2] == "get @S/unload/ 'file://C:/data/' parallel = 4;"
+    assert statements[3] == 'drop stage if exists S;'